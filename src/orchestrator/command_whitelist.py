@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+import re
 import shlex
 from dataclasses import dataclass
 from typing import Optional
@@ -15,10 +17,25 @@ from src.orchestrator.whitelist_rules import (
 )
 from src.types import RiskLevel
 
+# 命令链词法单元：引号串（未闭合时吞掉剩余部分）、&& / ||、普通字符段
+_CHAIN_TOKEN_RE = re.compile(r"'[^']*'?|\"[^\"]*\"?|&&|\|\||[^'\"&|]+|[&|]")
+_SINGLE_QUOTED_RE = re.compile(r"'[^']*'")
+_DOUBLE_QUOTED_RE = re.compile(r'"[^"]*"')
+_SAFE_REDIRECT_RES = (
+    re.compile(r"\d*>{1,2}\s*/dev/null"),  # 2>/dev/null, >/dev/null, >>/dev/null
+    re.compile(r"\d*>&\d+"),  # 2>&1, >&2
+)
+_FD_MERGE_RE = re.compile(r"\d*>&\d+")
+_REDIRECT_RE = re.compile(r">{1,2}")
+_ECHO_REDIRECT_TARGET_RE = re.compile(r">\s*([/\w.-]+)")
+# 一次扫描判断是否含任一危险模式，命中后再按列表顺序定位具体模式
+_DANGEROUS_PATTERN_RE = re.compile("|".join(map(re.escape, DANGEROUS_PATTERNS)))
+_ECHO_PREFIX = "echo "
+
 
-@dataclass
+@dataclass(frozen=True)
 class CommandCheckResult:
-    """命令检查结果"""
+    """命令检查结果（只读，check_command_safety 的缓存结果可安全共享）"""
 
     allowed: Optional[bool]  # 是否允许执行（None=未匹配，交由规则引擎判定）
     risk_level: Optional[RiskLevel]  # 风险等级（None=未匹配时无等级）
@@ -101,34 +118,21 @@ def split_chain_commands(command: str) -> list[str]:
     Returns:
         子命令列表（至少一个元素）
     """
+    if "&&" not in command and "||" not in command:
+        stripped = command.strip()
+        return [stripped] if stripped else [command]
+
     parts: list[str] = []
     current: list[str] = []
-    in_single_quote = False
-    in_double_quote = False
-    i = 0
-
-    while i < len(command):
-        char = command[i]
-
-        if char == "'" and not in_double_quote:
-            in_single_quote = not in_single_quote
-            current.append(char)
-        elif char == '"' and not in_single_quote:
-            in_double_quote = not in_double_quote
-            current.append(char)
-        elif not in_single_quote and not in_double_quote:
-            if i + 1 < len(command) and command[i : i + 2] in ("&&", "||"):
-                part = "".join(current).strip()
-                if part:
-                    parts.append(part)
-                current = []
-                i += 2
-                continue
-            current.append(char)
-        else:
-            current.append(char)
 
-        i += 1
+    for token in _CHAIN_TOKEN_RE.findall(command):
+        if token == "&&" or token == "||":
+            part = "".join(current).strip()
+            if part:
+                parts.append(part)
+            current = []
+        else:
+            current.append(token)
 
     part = "".join(current).strip()
     if part:
@@ -150,22 +154,16 @@ def check_redirect_safety(command: str) -> Optional[str]:
     Returns:
         拒绝原因字符串，安全则返回 None
     """
-    import re
-
     # 移除引号内容，避免误判（如 grep ">" file）
-    cleaned = re.sub(r"'[^']*'", "", command)
-    cleaned = re.sub(r'"[^"]*"', "", cleaned)
+    cleaned = _SINGLE_QUOTED_RE.sub("", command)
+    cleaned = _DOUBLE_QUOTED_RE.sub("", cleaned)
 
     # 移除安全的重定向模式
-    safe_redirects = [
-        r"\d*>{1,2}\s*/dev/null",  # 2>/dev/null, >/dev/null, >>/dev/null
-        r"\d*>&\d+",  # 2>&1, >&2
-    ]
-    for pattern in safe_redirects:
-        cleaned = re.sub(pattern, " ", cleaned)
+    for pattern in _SAFE_REDIRECT_RES:
+        cleaned = pattern.sub(" ", cleaned)
 
     # 移除安全模式后，检查是否还有残留的重定向
-    if re.search(r">{1,2}", cleaned):
+    if _REDIRECT_RE.search(cleaned):
         return (
             "File redirect (> or >>) is not allowed. "
             "Redirect to /dev/null is OK (e.g., 2>/dev/null). "
@@ -178,6 +176,11 @@ def check_redirect_safety(command: str) -> Optional[str]:
     return None
 
 
+def _is_echo_command(command: str) -> bool:
+    """是否为 echo 命令（echo 走 _check_echo_safety 的专属校验）"""
+    return command.lstrip().startswith(_ECHO_PREFIX)
+
+
 def check_dangerous_patterns(command: str) -> Optional[str]:
     """检查危险模式
 
@@ -187,10 +190,11 @@ def check_dangerous_patterns(command: str) -> Optional[str]:
     注意：&&、||、>、>>、< 不在 DANGEROUS_PATTERNS 中，
     由 split_chain_commands 和 check_redirect_safety 智能处理。
     """
-    command_stripped = command.strip()
-
     # echo 命令跳过通用危险模式检查，由 _check_echo_safety 单独处理
-    if command_stripped.startswith("echo "):
+    if _is_echo_command(command):
+        return None
+
+    if not _DANGEROUS_PATTERN_RE.search(command):
         return None
 
     # 其他命令：正常检查所有危险模式
@@ -213,13 +217,11 @@ def _has_standalone_ampersand(command: str) -> bool:
     - && 命令链（由 split_chain_commands 处理）
     - 2>&1, >&2 等重定向流合并
     """
-    import re
-
     # 移除引号内容
-    temp = re.sub(r"'[^']*'", "", command)
-    temp = re.sub(r'"[^"]*"', "", temp)
+    temp = _SINGLE_QUOTED_RE.sub("", command)
+    temp = _DOUBLE_QUOTED_RE.sub("", temp)
     # 移除重定向流合并模式：2>&1, >&2, 1>&2 等
-    temp = re.sub(r"\d*>&\d+", "", temp)
+    temp = _FD_MERGE_RE.sub("", temp)
     # 移除 &&（由 split_chain_commands 处理）
     temp = temp.replace("&&", "")
     # 剩余内容中如果还有 & 则是后台执行
@@ -238,8 +240,6 @@ def _check_echo_safety(command: str) -> Optional[str]:
     Returns:
         拒绝原因字符串，安全则返回 None
     """
-    import re as _re
-
     # 检查重定向目标路径
     dangerous_write_paths = [
         "/etc/",
@@ -255,7 +255,7 @@ def _check_echo_safety(command: str) -> Optional[str]:
         "/lib/",
     ]
 
-    redirect_match = _re.search(r">\s*([/\w.-]+)", command)
+    redirect_match = _ECHO_REDIRECT_TARGET_RE.search(command)
     if redirect_match:
         redirect_target = redirect_match.group(1)
         for dangerous_path in dangerous_write_paths:
@@ -446,14 +446,14 @@ def _check_chain_safety(sub_commands: list[str]) -> CommandCheckResult:
 
 def _check_single_command_safety(command: str) -> CommandCheckResult:
     """检查单条命令的安全性（不含 && / ||）"""
-    # 1. 检查危险模式（;、$()、`、& 等）
-    danger_reason = check_dangerous_patterns(command)
-    if danger_reason:
-        return CommandCheckResult(allowed=False, risk_level="high", reason=danger_reason)
-
-    # 1.5 检查重定向安全性（允许 2>/dev/null，拦截文件写入）
-    # echo 命令跳过通用重定向检查，由 _check_echo_safety 单独处理
-    if not command.strip().startswith("echo "):
+    # echo 命令跳过通用危险模式和重定向检查，由 _check_echo_safety 单独处理
+    if not _is_echo_command(command):
+        # 1. 检查危险模式（;、$()、`、& 等）
+        danger_reason = check_dangerous_patterns(command)
+        if danger_reason:
+            return CommandCheckResult(allowed=False, risk_level="high", reason=danger_reason)
+
+        # 1.5 检查重定向安全性（允许 2>/dev/null，拦截文件写入）
         redirect_reason = check_redirect_safety(command)
         if redirect_reason:
             return CommandCheckResult(
@@ -547,11 +547,13 @@ def _check_single_command_safety(command: str) -> CommandCheckResult:
     )
 
 
+@functools.lru_cache(maxsize=4096)
 def check_command_safety(command: str) -> CommandCheckResult:
     """检查命令是否安全
 
     支持 && / || 命令链：自动拆分后独立检查每个子命令。
     支持安全重定向：2>/dev/null、2>&1 等不被拦截。
+    结果只取决于命令字符串和静态规则表，按命令缓存。
     """
     command = command.strip()
 
@@ -5,11 +5,63 @@
 
 from __future__ import annotations
 
+import functools
 import re
-from typing import List, Optional
+from typing import Callable, ClassVar, List, Optional
 
 from src.types import WorkerResult
 
+_PORT_COLON_RE = re.compile(r":(\d{2,5})")
+_PORT_WORD_RE = re.compile(r"port\s*(\d{2,5})")
+# 支持带连字符的命令名，如 docker-compose
+_CMD_SUFFIX_RE = re.compile(r"command not found:\s*([\w\-]+)")
+_CMD_PREFIX_RE = re.compile(r"([\w\-]+):\s*command not found")
+
+# suggest_fix 判断所需的全部关键词（小写）
+_KEYWORDS = (
+    "command not found",
+    "not found",
+    "no such container",
+    "container",
+    "docker",
+    "permission denied",
+    "address already in use",
+    "bind",
+    "port",
+    "cannot connect to the docker daemon",
+    "no such file",
+    "does not exist",
+    "enoent",
+    "connection refused",
+    "connection timed out",
+    "network unreachable",
+    "no route to host",
+    "name resolution",
+    "dns",
+    "no space left",
+    "disk quota exceeded",
+    "enospc",
+    "git",
+    "not a git repository",
+    "authentication failed",
+    "merge conflict",
+    "already exists",
+)
+
+
+@functools.lru_cache(maxsize=512)
+def _scan_keywords(error_msg: str) -> frozenset[str]:
+    """扫描错误消息，返回其中出现的关键词集合
+
+    逐个关键词做 str 子串查找（C 层 fastsearch），比单条正则交替扫描更快。
+    纯函数，重试等场景下相同消息直接命中缓存。
+    """
+    return frozenset([k for k in _KEYWORDS if k in error_msg])
+
+
+_Predicate = Callable[["ErrorHelper", frozenset[str]], bool]
+_Builder = Callable[["ErrorHelper", str, frozenset[str]], list[str]]
+
 
 class ErrorHelper:
     """错误提示助手
@@ -31,45 +83,13 @@ class ErrorHelper:
             return None
 
         error_msg = result.message.lower()
+        hits = _scan_keywords(error_msg)
         suggestions: List[str] = []
 
-        # 命令未找到（优先级最高，避免被其他 "not found" 规则捕获）
-        if "command not found" in error_msg:
-            cmd = self._extract_command(error_msg)
-            suggestions = self._suggest_command_not_found(cmd)
-
-        # 容器未找到
-        elif self._is_container_not_found(error_msg):
-            suggestions = self._suggest_container_not_found()
-
-        # 权限不足
-        elif "permission denied" in error_msg:
-            suggestions = self._suggest_permission_denied()
-
-        # 端口占用
-        elif self._is_port_in_use(error_msg):
-            port = self._extract_port(error_msg)
-            suggestions = self._suggest_port_in_use(port)
-
-        # Docker 未运行
-        elif "cannot connect to the docker daemon" in error_msg:
-            suggestions = self._suggest_docker_not_running()
-
-        # 文件不存在（优先级最低，因为 "not found" 是通用匹配）
-        elif self._is_file_not_found(error_msg):
-            suggestions = self._suggest_file_not_found()
-
-        # 网络错误
-        elif self._is_network_error(error_msg):
-            suggestions = self._suggest_network_error()
-
-        # 磁盘空间不足
-        elif self._is_disk_full(error_msg):
-            suggestions = self._suggest_disk_full()
-
-        # Git 相关错误
-        elif self._is_git_error(error_msg):
-            suggestions = self._suggest_git_error(error_msg)
+        for matches, build in self._RULES:
+            if matches(self, hits):
+                suggestions = build(self, error_msg, hits)
+                break
 
         # 通用建议
         if not suggestions:
@@ -78,11 +98,11 @@ class ErrorHelper:
         return "\n".join(suggestions)
 
     @staticmethod
-    def _is_container_not_found(error_msg: str) -> bool:
+    def _is_container_not_found(hits: frozenset[str]) -> bool:
         """检查是否为容器未找到错误"""
         return (
-            "not found" in error_msg and ("container" in error_msg or "docker" in error_msg)
-        ) or "no such container" in error_msg
+            "not found" in hits and ("container" in hits or "docker" in hits)
+        ) or "no such container" in hits
 
     @staticmethod
     def _suggest_container_not_found() -> List[str]:
@@ -112,19 +132,17 @@ class ErrorHelper:
         ]
 
     @staticmethod
-    def _is_port_in_use(error_msg: str) -> bool:
+    def _is_port_in_use(hits: frozenset[str]) -> bool:
         """检查是否为端口占用错误"""
-        return "address already in use" in error_msg or (
-            "bind" in error_msg and "port" in error_msg
-        )
+        return "address already in use" in hits or ("bind" in hits and "port" in hits)
 
     @staticmethod
     def _extract_port(error_msg: str) -> str:
         """从错误消息中提取端口号"""
-        port_match = re.search(r":(\d{2,5})", error_msg)
+        port_match = _PORT_COLON_RE.search(error_msg)
         if port_match:
             return port_match.group(1)
-        port_match = re.search(r"port\s*(\d{2,5})", error_msg)
+        port_match = _PORT_WORD_RE.search(error_msg)
         if port_match:
             return port_match.group(1)
         return "<端口号>"
@@ -142,13 +160,13 @@ class ErrorHelper:
         ]
 
     @staticmethod
-    def _is_file_not_found(error_msg: str) -> bool:
+    def _is_file_not_found(hits: frozenset[str]) -> bool:
         """检查是否为文件不存在错误"""
         return (
-            "no such file" in error_msg
-            or "not found" in error_msg
-            or "does not exist" in error_msg
-            or "enoent" in error_msg
+            "no such file" in hits
+            or "not found" in hits
+            or "does not exist" in hits
+            or "enoent" in hits
         )
 
     @staticmethod
@@ -178,11 +196,10 @@ class ErrorHelper:
     @staticmethod
     def _extract_command(error_msg: str) -> str:
         """从错误消息中提取命令名"""
-        # 支持带连字符的命令名，如 docker-compose
-        cmd_match = re.search(r"command not found:\s*([\w\-]+)", error_msg)
+        cmd_match = _CMD_SUFFIX_RE.search(error_msg)
         if cmd_match:
             return cmd_match.group(1)
-        cmd_match = re.search(r"([\w\-]+):\s*command not found", error_msg)
+        cmd_match = _CMD_PREFIX_RE.search(error_msg)
         if cmd_match:
             return cmd_match.group(1)
         return "<命令>"
@@ -201,15 +218,15 @@ class ErrorHelper:
         ]
 
     @staticmethod
-    def _is_network_error(error_msg: str) -> bool:
+    def _is_network_error(hits: frozenset[str]) -> bool:
         """检查是否为网络错误"""
         return (
-            "connection refused" in error_msg
-            or "connection timed out" in error_msg
-            or "network unreachable" in error_msg
-            or "no route to host" in error_msg
-            or "name resolution" in error_msg
-            or "dns" in error_msg
+            "connection refused" in hits
+            or "connection timed out" in hits
+            or "network unreachable" in hits
+            or "no route to host" in hits
+            or "name resolution" in hits
+            or "dns" in hits
         )
 
     @staticmethod
@@ -226,13 +243,9 @@ class ErrorHelper:
         ]
 
     @staticmethod
-    def _is_disk_full(error_msg: str) -> bool:
+    def _is_disk_full(hits: frozenset[str]) -> bool:
         """检查是否为磁盘空间不足错误"""
-        return (
-            "no space left" in error_msg
-            or "disk quota exceeded" in error_msg
-            or "enospc" in error_msg
-        )
+        return "no space left" in hits or "disk quota exceeded" in hits or "enospc" in hits
 
     @staticmethod
     def _suggest_disk_full() -> List[str]:
@@ -250,19 +263,19 @@ class ErrorHelper:
         ]
 
     @staticmethod
-    def _is_git_error(error_msg: str) -> bool:
+    def _is_git_error(hits: frozenset[str]) -> bool:
         """检查是否为 Git 错误"""
-        return "git" in error_msg and (
-            "not a git repository" in error_msg
-            or "authentication failed" in error_msg
-            or "merge conflict" in error_msg
-            or "already exists" in error_msg
+        return "git" in hits and (
+            "not a git repository" in hits
+            or "authentication failed" in hits
+            or "merge conflict" in hits
+            or "already exists" in hits
         )
 
     @staticmethod
-    def _suggest_git_error(error_msg: str) -> List[str]:
+    def _suggest_git_error(hits: frozenset[str]) -> List[str]:
         """Git 错误的建议"""
-        if "not a git repository" in error_msg:
+        if "not a git repository" in hits:
             return [
                 "不是 Git 仓库，尝试以下方法：",
                 "  1. 初始化 Git 仓库：",
@@ -270,7 +283,7 @@ class ErrorHelper:
                 "  2. 切换到正确的目录：",
                 "     cd <项目目录>",
             ]
-        elif "authentication failed" in error_msg:
+        elif "authentication failed" in hits:
             return [
                 "Git 认证失败，尝试以下方法：",
                 "  1. 检查 Git 凭据：",
@@ -279,7 +292,7 @@ class ErrorHelper:
                 "     git remote set-url origin git@github.com:<user>/<repo>.git",
                 "  3. 生成新的 SSH 密钥或 Token",
             ]
-        elif "merge conflict" in error_msg:
+        elif "merge conflict" in hits:
             return [
                 "Git 合并冲突，尝试以下方法：",
                 "  1. 查看冲突文件：",
@@ -288,7 +301,7 @@ class ErrorHelper:
                 "  3. 放弃合并：",
                 "     git merge --abort",
             ]
-        elif "already exists" in error_msg:
+        elif "already exists" in hits:
             return [
                 "目录已存在，尝试以下方法：",
                 "  1. 使用其他目录名",
@@ -335,3 +348,53 @@ class ErrorHelper:
             )
 
         return result
+
+    # 错误类型规则表：(命中判断, 建议生成)，按优先级排列，第一个命中的规则生效
+    # 通过 self 调用，子类覆盖 _is_* / _suggest_* / _extract_* 仍然生效
+    _RULES: ClassVar[tuple[tuple[_Predicate, _Builder], ...]] = (
+        # 命令未找到（优先级最高，避免被其他 "not found" 规则捕获）
+        (
+            lambda self, hits: "command not found" in hits,
+            lambda self, msg, hits: self._suggest_command_not_found(self._extract_command(msg)),
+        ),
+        # 容器未找到
+        (
+            lambda self, hits: self._is_container_not_found(hits),
+            lambda self, msg, hits: self._suggest_container_not_found(),
+        ),
+        # 权限不足
+        (
+            lambda self, hits: "permission denied" in hits,
+            lambda self, msg, hits: self._suggest_permission_denied(),
+        ),
+        # 端口占用
+        (
+            lambda self, hits: self._is_port_in_use(hits),
+            lambda self, msg, hits: self._suggest_port_in_use(self._extract_port(msg)),
+        ),
+        # Docker 未运行
+        (
+            lambda self, hits: "cannot connect to the docker daemon" in hits,
+            lambda self, msg, hits: self._suggest_docker_not_running(),
+        ),
+        # 文件不存在（"not found" 是通用匹配，排在更具体的规则之后）
+        (
+            lambda self, hits: self._is_file_not_found(hits),
+            lambda self, msg, hits: self._suggest_file_not_found(),
+        ),
+        # 网络错误
+        (
+            lambda self, hits: self._is_network_error(hits),
+            lambda self, msg, hits: self._suggest_network_error(),
+        ),
+        # 磁盘空间不足
+        (
+            lambda self, hits: self._is_disk_full(hits),
+            lambda self, msg, hits: self._suggest_disk_full(),
+        ),
+        # Git 相关错误
+        (
+            lambda self, hits: self._is_git_error(hits),
+            lambda self, msg, hits: self._suggest_git_error(hits),
+        ),
+    )
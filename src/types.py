@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Literal, Optional, Protocol, Union, runtime_checkable
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 RiskLevel = Literal["safe", "medium", "high"]
 
@@ -56,7 +56,12 @@ class Instruction(BaseModel):
 
 
 class WorkerResult(BaseModel):
-    """Worker 返回给 Orchestrator 的结果"""
+    """Worker 返回给 Orchestrator 的结果
+
+    结果只读，可在调用方之间安全共享同一实例。
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     success: bool = Field(..., description="执行是否成功")
     data: Union[
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import os
-import re
 import shlex
 from typing import Optional, Union, cast
 
@@ -18,7 +17,7 @@ from src.workers.deploy.types import (
     ConfirmationCallback,
     ProgressCallback,
 )
-from src.workers.http import HttpWorker
+from src.workers.http import HttpWorker, parse_github_url
 from src.workers.shell import ShellWorker
 
 
@@ -103,11 +102,7 @@ class DeployWorker(BaseWorker):
             )
 
     def _parse_github_url(self, url: str) -> Optional[tuple[str, str]]:
-        pattern = r"https?://github\.com/([\w\-\.]+)/([\w\-\.]+?)(?:\.git)?/?$"
-        match = re.match(pattern, url)
-        if match:
-            return (match.group(1), match.group(2))
-        return None
+        return parse_github_url(url)
 
     async def _intelligent_deploy(self, args: dict[str, ArgValue]) -> WorkerResult:
         """LLM 驱动的智能部署"""
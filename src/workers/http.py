@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 import re
+from collections.abc import Awaitable, Callable
 from typing import Optional, Union, cast
 from urllib.parse import urlparse
 
@@ -12,6 +14,30 @@ from src.config.manager import HttpConfig
 from src.types import ActionParam, ArgValue, ToolAction, WorkerResult
 from src.workers.base import BaseWorker
 
+# 支持的格式:
+# https://github.com/owner/repo
+# https://github.com/owner/repo/
+# https://github.com/owner/repo.git
+_GITHUB_URL_RE = re.compile(r"https?://github\.com/([\w\-\.]+)/([\w\-\.]+?)(?:\.git)?/?$")
+
+
+@functools.lru_cache(maxsize=256)
+def parse_github_url(url: str) -> Optional[tuple[str, str]]:
+    """解析 GitHub URL，提取 owner 和 repo
+
+    纯函数，同一仓库 URL 在一次部署中会被多次解析，结果按 URL 缓存。
+
+    Args:
+        url: GitHub 仓库 URL
+
+    Returns:
+        (owner, repo) 元组，解析失败返回 None
+    """
+    match = _GITHUB_URL_RE.match(url)
+    if match:
+        return (match.group(1), match.group(2))
+    return None
+
 
 class HttpWorker(BaseWorker):
     """HTTP 请求 Worker
@@ -31,6 +57,12 @@ class HttpWorker(BaseWorker):
         self._config = config
         self._timeout = config.timeout
         self._github_token = config.github_token
+        # 动作名 → 绑定方法，构造时建好一次，execute 只做字典查找
+        self._handlers: dict[str, Callable[[dict[str, ArgValue]], Awaitable[WorkerResult]]] = {
+            "fetch_url": self._fetch_url,
+            "fetch_github_readme": self._fetch_github_readme,
+            "list_github_files": self._list_github_files,
+        }
 
     @property
     def name(self) -> str:
@@ -99,15 +131,7 @@ class HttpWorker(BaseWorker):
         Returns:
             (owner, repo) 元组，解析失败返回 None
         """
-        # 支持的格式:
-        # https://github.com/owner/repo
-        # https://github.com/owner/repo/
-        # https://github.com/owner/repo.git
-        pattern = r"https?://github\.com/([\w\-\.]+)/([\w\-\.]+?)(?:\.git)?/?$"
-        match = re.match(pattern, url)
-        if match:
-            return (match.group(1), match.group(2))
-        return None
+        return parse_github_url(url)
 
     async def execute(
         self,
@@ -115,17 +139,13 @@ class HttpWorker(BaseWorker):
         args: dict[str, ArgValue],
     ) -> WorkerResult:
         """执行 HTTP 操作"""
-        if action == "fetch_url":
-            return await self._fetch_url(args)
-        elif action == "fetch_github_readme":
-            return await self._fetch_github_readme(args)
-        elif action == "list_github_files":
-            return await self._list_github_files(args)
-        else:
+        handler = self._handlers.get(action)
+        if handler is None:
             return WorkerResult(
                 success=False,
                 message=f"Unknown action: {action}",
             )
+        return await handler(args)
 
     async def _fetch_url(self, args: dict[str, ArgValue]) -> WorkerResult:
         """获取 URL 内容"""
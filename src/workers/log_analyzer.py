@@ -20,50 +20,56 @@ from src.types import (
 from src.workers.base import BaseWorker
 
 # 日志级别识别正则（按优先级排序）
-_LEVEL_PATTERNS: list[tuple[str, LogLevel]] = [
-    (r"\bFATAL\b", "FATAL"),
-    (r"\bERROR\b", "ERROR"),
-    (r"\bERR\b", "ERROR"),
-    (r"\bWARN(?:ING)?\b", "WARN"),
-    (r"\bINFO\b", "INFO"),
-    (r"\bDEBUG\b", "DEBUG"),
-    (r"\bTRACE\b", "TRACE"),
+_LEVEL_PATTERNS: list[tuple[re.Pattern[str], LogLevel]] = [
+    (re.compile(r"\bFATAL\b"), "FATAL"),
+    (re.compile(r"\bERROR\b"), "ERROR"),
+    (re.compile(r"\bERR\b"), "ERROR"),
+    (re.compile(r"\bWARN(?:ING)?\b"), "WARN"),
+    (re.compile(r"\bINFO\b"), "INFO"),
+    (re.compile(r"\bDEBUG\b"), "DEBUG"),
+    (re.compile(r"\bTRACE\b"), "TRACE"),
 ]
+# 从消息体中剥离级别标记：各标记两侧都是单词边界，一次交替匹配与逐个替换结果相同
+_LEVEL_STRIP_RE = re.compile("|".join(p.pattern for p, _ in _LEVEL_PATTERNS), flags=re.IGNORECASE)
+_LEADING_SEPARATORS_RE = re.compile(r"^[\s\-\[\]|:]+")
 
 # 时间戳正则（常见格式）
-_TIMESTAMP_PATTERNS: list[str] = [
+_TIMESTAMP_PATTERNS: list[re.Pattern[str]] = [
     # ISO 8601: 2024-01-15T09:30:45.123Z
-    r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?",
+    re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?"),
     # Common: 2024-01-15 09:30:45
-    r"\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(?:\.\d+)?",
+    re.compile(r"\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(?:\.\d+)?"),
     # Syslog: Jan 15 09:30:45
-    r"[A-Z][a-z]{2}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}",
+    re.compile(r"[A-Z][a-z]{2}\s+\d{1,2}\s+\d{2}:\d{2}:\d{2}"),
     # Docker JSON: 2024-01-15T09:30:45.123456789Z
-    r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z",
+    re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z"),
     # Nginx: 15/Jan/2024:09:30:45 +0800
-    r"\d{2}/[A-Z][a-z]{2}/\d{4}:\d{2}:\d{2}:\d{2}\s+[+-]\d{4}",
+    re.compile(r"\d{2}/[A-Z][a-z]{2}/\d{4}:\d{2}:\d{2}:\d{2}\s+[+-]\d{4}"),
     # Time only: 09:30:45
-    r"\d{2}:\d{2}:\d{2}",
+    re.compile(r"\d{2}:\d{2}:\d{2}"),
 ]
 
 # 用于模式归一化的替换规则（顺序重要：UUID 在 HEX 之前）
-_NORMALIZE_RULES: list[tuple[str, str]] = [
+_NORMALIZE_RULES: list[tuple[re.Pattern[str], str]] = [
     # UUID（必须在 HEX 之前）
-    (r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", "<UUID>"),
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"), "<UUID>"),
     # IP 地址（必须在纯数字之前）
-    (r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}", "<IP>"),
+    (re.compile(r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}"), "<IP>"),
     # 十六进制 ID（容器 ID、commit hash 等）
-    (r"\b[0-9a-f]{8,}\b", "<HEX>"),
+    (re.compile(r"\b[0-9a-f]{8,}\b"), "<HEX>"),
     # 纯数字（PID、端口、行号等）
-    (r"\b\d+\b", "<N>"),
+    (re.compile(r"\b\d+\b"), "<N>"),
     # 连续空格压缩
-    (r"\s+", " "),
+    (re.compile(r"\s+"), " "),
 ]
 
 # 错误级别集合
 _ERROR_LEVELS: set[LogLevel] = {"ERROR", "FATAL"}
 _WARN_LEVELS: set[LogLevel] = {"WARN"}
 
+# 趋势统计用的 HH:MM 提取
+_HOUR_MINUTE_RE = re.compile(r"(\d{2}):(\d{2})")
+
 
 class LogAnalyzerWorker(BaseWorker):
     """日志分析 Worker
@@ -343,7 +349,7 @@ class LogAnalyzerWorker(BaseWorker):
 
     def _extract_timestamp(self, line: str) -> Optional[str]:
         for pattern in _TIMESTAMP_PATTERNS:
-            match = re.search(pattern, line)
+            match = pattern.search(line)
             if match:
                 return match.group(0)
         return None
@@ -351,7 +357,7 @@ class LogAnalyzerWorker(BaseWorker):
     def _extract_level(self, line: str) -> LogLevel:
         upper_line = line.upper()
         for pattern, level in _LEVEL_PATTERNS:
-            if re.search(pattern, upper_line):
+            if pattern.search(upper_line):
                 return level
         return "UNKNOWN"
 
@@ -363,9 +369,8 @@ class LogAnalyzerWorker(BaseWorker):
                 msg = msg[idx + len(timestamp):]
 
         # 去掉级别标记和前导分隔符
-        for pattern, _ in _LEVEL_PATTERNS:
-            msg = re.sub(pattern, "", msg, flags=re.IGNORECASE)
-        msg = re.sub(r"^[\s\-\[\]|:]+", "", msg)
+        msg = _LEVEL_STRIP_RE.sub("", msg)
+        msg = _LEADING_SEPARATORS_RE.sub("", msg)
         return msg.strip()
 
     # ------------------------------------------------------------------
@@ -374,7 +379,7 @@ class LogAnalyzerWorker(BaseWorker):
     def _normalize_message(self, message: str) -> str:
         result = message
         for pattern, replacement in _NORMALIZE_RULES:
-            result = re.sub(pattern, replacement, result)
+            result = pattern.sub(replacement, result)
         return result.strip()
 
     # ------------------------------------------------------------------
@@ -390,7 +395,7 @@ class LogAnalyzerWorker(BaseWorker):
             if not ts:
                 continue
             # 提取 HH:MM（5分钟窗口）
-            time_match = re.search(r"(\d{2}):(\d{2})", ts)
+            time_match = _HOUR_MINUTE_RE.search(ts)
             if not time_match:
                 continue
             hour = time_match.group(1)
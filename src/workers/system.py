@@ -12,10 +12,28 @@ from src.workers.base import BaseWorker
 from src.workers.file_ops import append_to_file, replace_in_file, write_file
 from src.workers.path_utils import normalize_path
 
+# delete_files 模拟执行时最多列出的文件数
+_DELETE_PREVIEW_LIMIT = 3
+
 
 class SystemWorker(BaseWorker):
     """系统文件操作 Worker"""
 
+    def __init__(self) -> None:
+        # 动作名 → 绑定方法，构造时建好一次，execute 只做字典查找
+        self._handlers: dict[
+            str,
+            Callable[[dict[str, ArgValue], bool], Awaitable[WorkerResult]],
+        ] = {
+            "list_files": self._list_files,
+            "find_large_files": self._find_large_files,
+            "check_disk_usage": self._check_disk_usage,
+            "delete_files": self._delete_files,
+            "write_file": self._write_file,
+            "append_to_file": self._append_to_file,
+            "replace_in_file": self._replace_in_file,
+        }
+
     @property
     def name(self) -> str:
         return "system"
@@ -126,20 +144,7 @@ class SystemWorker(BaseWorker):
         if isinstance(dry_run, str):
             dry_run = dry_run.lower() == "true"
 
-        handlers: dict[
-            str,
-            Callable[[dict[str, ArgValue], bool], Awaitable[WorkerResult]],
-        ] = {
-            "list_files": self._list_files,
-            "find_large_files": self._find_large_files,
-            "check_disk_usage": self._check_disk_usage,
-            "delete_files": self._delete_files,
-            "write_file": self._write_file,
-            "append_to_file": self._append_to_file,
-            "replace_in_file": self._replace_in_file,
-        }
-
-        handler = handlers.get(action)
+        handler = self._handlers.get(action)
         if handler is None:
             return WorkerResult(
                 success=False,
@@ -225,7 +230,10 @@ class SystemWorker(BaseWorker):
         if dry_run:
             return WorkerResult(
                 success=True,
-                message=f"[DRY-RUN] Would search for files larger than {min_size_mb}MB in {path_str}",
+                message=(
+                    "[DRY-RUN] Would search for files larger than "
+                    f"{min_size_mb}MB in {path_str}"
+                ),
                 simulated=True,
             )
 
@@ -323,9 +331,11 @@ class SystemWorker(BaseWorker):
             return WorkerResult(success=False, message="files list cannot be empty")
 
         if dry_run:
+            preview = ", ".join(map(str, files[:_DELETE_PREVIEW_LIMIT]))
+            more = "..." if len(files) > _DELETE_PREVIEW_LIMIT else ""
             return WorkerResult(
                 success=True,
-                message=f"[DRY-RUN] Would delete {len(files)} files: {', '.join(str(f) for f in files[:3])}{'...' if len(files) > 3 else ''}",
+                message=f"[DRY-RUN] Would delete {len(files)} files: {preview}{more}",
                 simulated=True,
             )
 
@@ -0,0 +1,38 @@
+"""pytest 全局配置与共享 fixture"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from typing import NamedTuple
+
+import pytest
+
+# CI 环境是一次性的，写 .pyc 只有 I/O 开销
+if os.environ.get("CI"):
+    sys.dont_write_bytecode = True
+    os.environ.setdefault("PYTHONDONTWRITEBYTECODE", "1")
+
+
+class _DiskUsage(NamedTuple):
+    """与 shutil.disk_usage 返回值字段一致（SystemWorker 只读取这三个属性）"""
+
+    total: int
+    used: int
+    free: int
+
+
+@pytest.fixture
+def fake_disk_usage(monkeypatch: pytest.MonkeyPatch) -> _DiskUsage:
+    """固定 shutil.disk_usage 的返回值（100 GB 已用 42 GB），避免测试访问真实文件系统"""
+    gib = 1024 * 1024 * 1024
+    usage = _DiskUsage(total=100 * gib, used=42 * gib, free=58 * gib)
+    monkeypatch.setattr(shutil, "disk_usage", lambda path: usage)
+    return usage
+
+
+@pytest.fixture
+def _no_local_project_files(monkeypatch: pytest.MonkeyPatch) -> None:
+    """克隆目录在测试中并不存在，统一让 planner/executor 的文件探测返回 False"""
+    monkeypatch.setattr("os.path.exists", lambda path: False)
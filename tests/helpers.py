@@ -0,0 +1,48 @@
+"""测试共享辅助函数
+
+与 conftest.py 不同，这里只放普通函数与常量，测试模块显式导入使用。
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+from src.types import WorkerResult
+
+
+def stub_repo_info(http_worker: AsyncMock, key_files: str, readme: str = "# App") -> None:
+    """设置 HttpWorker 依次返回 README 与关键文件列表（deploy 第一步的两次请求）"""
+    http_worker.execute.side_effect = [
+        WorkerResult(success=True, data={"content": readme}, message="README"),
+        WorkerResult(success=True, data={"key_files": key_files}, message="Files"),
+    ]
+
+
+class AsyncStub:
+    """轻量异步桩：只记录调用参数并返回预设值
+
+    用于只需要"返回某个值 + 断言调用次数/参数"的场景，
+    避免 AsyncMock 的 spec 推断与子 Mock 树开销。
+    """
+
+    def __init__(
+        self,
+        return_value: object = None,
+        side_effect: BaseException | None = None,
+    ) -> None:
+        self.return_value = return_value
+        self.side_effect = side_effect
+        self.call_count = 0
+        self.call_args: tuple[object, ...] = ()
+        self.call_kwargs: dict[str, object] = {}
+
+    async def __call__(self, *args: object, **kwargs: object) -> object:
+        self.call_count += 1
+        self.call_args, self.call_kwargs = args, kwargs
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.return_value
+
+
+# 外部命令不存在时 ShellWorker 的返回；WorkerResult 不可变，可在测试间共享同一实例
+SHELL_NOT_FOUND = WorkerResult(success=False, message="not found")
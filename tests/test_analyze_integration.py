@@ -142,32 +142,25 @@ class TestAnalyzeWorkerWithDefaultCommands:
     """测试使用默认命令的分析流程"""
 
     @pytest.mark.asyncio
-    async def test_uses_default_commands_for_docker(self) -> None:
-        """测试 docker 类型使用预置命令"""
+    @pytest.mark.parametrize(
+        "target_type,target",
+        [("docker", "test-container"), ("port", "8080")],
+        ids=["docker", "port"],
+    )
+    async def test_uses_default_commands(self, target_type: str, target: str) -> None:
+        """测试内置类型使用预置命令"""
         with tempfile.TemporaryDirectory() as tmpdir:
             cache = AnalyzeTemplateCache(Path(tmpdir) / "cache.json")
             mock_client = MockLLMClient(["分析结果"])
             worker = AnalyzeWorker(mock_client, cache=cache)  # type: ignore[arg-type]
 
             # 调用 _get_analyze_commands 应该返回预置命令
-            commands = await worker._get_analyze_commands("docker", "test-container")
+            commands = await worker._get_analyze_commands(target_type, target)
 
-            assert commands == DEFAULT_ANALYZE_COMMANDS["docker"]
+            assert commands == DEFAULT_ANALYZE_COMMANDS[target_type]
             # LLM 不应该被调用来生成命令
             assert mock_client._call_count == 0
 
-    @pytest.mark.asyncio
-    async def test_uses_default_commands_for_port(self) -> None:
-        """测试 port 类型使用预置命令"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cache = AnalyzeTemplateCache(Path(tmpdir) / "cache.json")
-            mock_client = MockLLMClient(["分析结果"])
-            worker = AnalyzeWorker(mock_client, cache=cache)  # type: ignore[arg-type]
-
-            commands = await worker._get_analyze_commands("port", "8080")
-
-            assert commands == DEFAULT_ANALYZE_COMMANDS["port"]
-
     @pytest.mark.asyncio
     async def test_cache_takes_priority_over_default(self) -> None:
         """测试缓存优先于预置命令"""
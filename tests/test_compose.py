@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
-
 import pytest
 
 from src.types import WorkerResult
 from src.workers.compose import ComposeWorker
+from tests.helpers import SHELL_NOT_FOUND, AsyncStub
 
 
 @pytest.fixture
@@ -161,43 +160,36 @@ def test_build_cmd_with_both(worker: ComposeWorker) -> None:
 
 
 @pytest.mark.asyncio
-async def test_detect_compose_v2(worker: ComposeWorker) -> None:
-    with patch.object(
-        worker._shell,
-        "execute",
-        new_callable=AsyncMock,
-        return_value=WorkerResult(success=True, message="Docker Compose version v2.20.0"),
-    ):
-        cmd = await worker._detect_compose_cmd()
-        assert cmd == "docker compose"
+async def test_detect_compose_v2(worker: ComposeWorker, monkeypatch: pytest.MonkeyPatch) -> None:
+    version = WorkerResult(success=True, message="Docker Compose version v2.20.0")
+    monkeypatch.setattr(worker._shell, "execute", AsyncStub(return_value=version))
+    cmd = await worker._detect_compose_cmd()
+    assert cmd == "docker compose"
 
 
 @pytest.mark.asyncio
-async def test_detect_compose_v1(worker: ComposeWorker) -> None:
+async def test_detect_compose_v1(worker: ComposeWorker, monkeypatch: pytest.MonkeyPatch) -> None:
     call_count = 0
 
     async def side_effect(action: str, args: dict) -> WorkerResult:  # type: ignore[type-arg]
         nonlocal call_count
         call_count += 1
         if call_count == 1:
-            return WorkerResult(success=False, message="not found")
+            return SHELL_NOT_FOUND
         return WorkerResult(success=True, message="docker-compose version 1.29.2")
 
-    with patch.object(worker._shell, "execute", side_effect=side_effect):
-        cmd = await worker._detect_compose_cmd()
-        assert cmd == "docker-compose"
+    monkeypatch.setattr(worker._shell, "execute", side_effect)
+    cmd = await worker._detect_compose_cmd()
+    assert cmd == "docker-compose"
 
 
 @pytest.mark.asyncio
-async def test_detect_compose_not_found(worker: ComposeWorker) -> None:
-    with patch.object(
-        worker._shell,
-        "execute",
-        new_callable=AsyncMock,
-        return_value=WorkerResult(success=False, message="not found"),
-    ):
-        cmd = await worker._detect_compose_cmd()
-        assert cmd == ""
+async def test_detect_compose_not_found(
+    worker: ComposeWorker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(worker._shell, "execute", AsyncStub(return_value=SHELL_NOT_FOUND))
+    cmd = await worker._detect_compose_cmd()
+    assert cmd == ""
 
 
 # ------------------------------------------------------------------
@@ -206,13 +198,8 @@ async def test_detect_compose_not_found(worker: ComposeWorker) -> None:
 
 
 @pytest.mark.asyncio
-async def test_status_no_compose(worker: ComposeWorker) -> None:
-    with patch.object(
-        worker._shell,
-        "execute",
-        new_callable=AsyncMock,
-        return_value=WorkerResult(success=False, message="not found"),
-    ):
-        result = await worker.execute("status", {})
-        assert result.success is False
-        assert "未找到" in result.message
+async def test_status_no_compose(worker: ComposeWorker, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(worker._shell, "execute", AsyncStub(return_value=SHELL_NOT_FOUND))
+    result = await worker.execute("status", {})
+    assert result.success is False
+    assert "未找到" in result.message
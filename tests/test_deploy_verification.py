@@ -5,20 +5,28 @@
 
 from __future__ import annotations
 
+import re
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from src.types import WorkerResult
 from src.workers.deploy.executor import DeployExecutor
+from src.workers.shell import ShellWorker
+
+# 端口不可达时的两种提示文案
+_UNREACHABLE_RE = re.compile(r"无法连接|无法访问")
+
+
+def _results(*rows: tuple[bool, str]) -> list[WorkerResult]:
+    """将 (success, message) 行批量构造为 shell 结果序列"""
+    return [WorkerResult(success=success, message=message) for success, message in rows]
 
 
 @pytest.fixture
-def mock_shell() -> MagicMock:
+def mock_shell() -> AsyncMock:
     """创建模拟的 ShellWorker"""
-    worker = MagicMock()
-    worker.execute = AsyncMock()
-    return worker
+    return AsyncMock(spec=ShellWorker)
 
 
 @pytest.fixture
@@ -30,7 +38,7 @@ def mock_diagnoser() -> MagicMock:
 
 
 @pytest.fixture
-def executor(mock_shell: MagicMock, mock_diagnoser: MagicMock) -> DeployExecutor:
+def executor(mock_shell: AsyncMock, mock_diagnoser: MagicMock) -> DeployExecutor:
     """创建 DeployExecutor 实例"""
     return DeployExecutor(mock_shell, mock_diagnoser)
 
@@ -40,7 +48,7 @@ class TestDockerRunVerification:
 
     @pytest.mark.asyncio
     async def test_verify_docker_run_success(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试容器运行成功的验证"""
         deploy_steps = [
@@ -67,11 +75,12 @@ class TestDockerRunVerification:
         assert info is not None
         assert info["container_name"] == "myapp"
 
+    @pytest.mark.looptime
     @pytest.mark.asyncio
     async def test_verify_docker_run_container_exited(
         self,
         executor: DeployExecutor,
-        mock_shell: MagicMock,
+        mock_shell: AsyncMock,
         mock_diagnoser: MagicMock,
     ) -> None:
         """测试容器退出时触发诊断和修复"""
@@ -87,15 +96,13 @@ class TestDockerRunVerification:
         # 第三次：获取日志
         # 第四次：执行修复命令
         # 第五次：修复后再次检查，容器运行成功
-        mock_shell.execute.side_effect = [
-            WorkerResult(success=True, message=""),  # docker ps: 无运行容器
-            WorkerResult(success=True, message="myapp Exited (1) 1 minute ago"),  # docker ps -a
-            WorkerResult(
-                success=True, message="Error: environment variable SECRET_KEY required"
-            ),  # logs
-            WorkerResult(success=True, message="ok"),  # 执行修复命令
-            WorkerResult(success=True, message="myapp Up 5 seconds"),  # 修复后检查
-        ]
+        mock_shell.execute.side_effect = _results(
+            (True, ""),  # docker ps: 无运行容器
+            (True, "myapp Exited (1) 1 minute ago"),  # docker ps -a
+            (True, "Error: environment variable SECRET_KEY required"),  # logs
+            (True, "ok"),  # 执行修复命令
+            (True, "myapp Up 5 seconds"),  # 修复后检查
+        )
 
         # 诊断器返回修复成功
         mock_diagnoser.react_diagnose_loop.return_value = (
@@ -121,7 +128,7 @@ class TestDockerRunVerification:
     async def test_verify_docker_run_cannot_fix(
         self,
         executor: DeployExecutor,
-        mock_shell: MagicMock,
+        mock_shell: AsyncMock,
         mock_diagnoser: MagicMock,
     ) -> None:
         """测试无法自动修复时返回失败"""
@@ -132,11 +139,11 @@ class TestDockerRunVerification:
             }
         ]
 
-        mock_shell.execute.side_effect = [
-            WorkerResult(success=True, message=""),  # docker ps
-            WorkerResult(success=True, message="myapp Exited (1)"),  # docker ps -a
-            WorkerResult(success=True, message="Fatal error: unknown"),  # logs
-        ]
+        mock_shell.execute.side_effect = _results(
+            (True, ""),  # docker ps
+            (True, "myapp Exited (1)"),  # docker ps -a
+            (True, "Fatal error: unknown"),  # logs
+        )
 
         mock_diagnoser.react_diagnose_loop.return_value = (
             False,  # fixed
@@ -159,7 +166,7 @@ class TestDockerRunVerification:
 
     @pytest.mark.asyncio
     async def test_verify_no_container_name_skips_verification(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试无容器名称时跳过验证"""
         deploy_steps = [{"description": "构建镜像", "command": "docker build -t myapp ."}]
@@ -181,7 +188,7 @@ class TestDockerComposeVerification:
 
     @pytest.mark.asyncio
     async def test_verify_compose_success(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试 docker compose 验证成功"""
         deploy_steps = [{"description": "启动服务", "command": "docker compose up -d"}]
@@ -203,22 +210,23 @@ class TestDockerComposeVerification:
         assert info is not None
         assert info["deployment_type"] == "compose"
 
+    @pytest.mark.looptime
     @pytest.mark.asyncio
     async def test_verify_compose_service_not_running(
         self,
         executor: DeployExecutor,
-        mock_shell: MagicMock,
+        mock_shell: AsyncMock,
         mock_diagnoser: MagicMock,
     ) -> None:
         """测试 docker compose 服务未运行时的修复"""
         deploy_steps = [{"description": "启动服务", "command": "docker compose up -d"}]
 
-        mock_shell.execute.side_effect = [
-            WorkerResult(success=True, message=""),  # docker compose ps: 无服务
-            WorkerResult(success=True, message="Error: SECRET_KEY required"),  # docker compose logs
-            WorkerResult(success=True, message="ok"),  # 执行修复命令
-            WorkerResult(success=True, message='{"State":"running"}'),  # 修复后检查
-        ]
+        mock_shell.execute.side_effect = _results(
+            (True, ""),  # docker compose ps: 无服务
+            (True, "Error: SECRET_KEY required"),  # docker compose logs
+            (True, "ok"),  # 执行修复命令
+            (True, '{"State":"running"}'),  # 修复后检查
+        )
 
         mock_diagnoser.react_diagnose_loop.return_value = (
             True,
@@ -240,7 +248,7 @@ class TestDockerComposeVerification:
 
     @pytest.mark.asyncio
     async def test_verify_compose_with_docker_hyphen_command(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试支持 docker-compose（带连字符）命令"""
         deploy_steps = [{"description": "启动服务", "command": "docker-compose up -d"}]
@@ -262,7 +270,7 @@ class TestPortHealthCheck:
 
     @pytest.mark.asyncio
     async def test_port_health_check_success_200(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试端口健康检查成功（HTTP 200）"""
         mock_shell.execute.return_value = WorkerResult(success=True, message="200")
@@ -275,7 +283,7 @@ class TestPortHealthCheck:
 
     @pytest.mark.asyncio
     async def test_port_health_check_success_3xx(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试端口健康检查成功（HTTP 3xx 重定向）"""
         mock_shell.execute.return_value = WorkerResult(success=True, message="301")
@@ -287,7 +295,7 @@ class TestPortHealthCheck:
 
     @pytest.mark.asyncio
     async def test_port_health_check_4xx_still_accessible(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试 HTTP 4xx 也算可访问（说明服务在运行）"""
         mock_shell.execute.return_value = WorkerResult(success=True, message="404")
@@ -300,28 +308,28 @@ class TestPortHealthCheck:
 
     @pytest.mark.asyncio
     async def test_port_health_check_connection_refused(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试端口无法连接"""
-        mock_shell.execute.side_effect = [
-            WorkerResult(success=True, message="000"),  # curl 失败
-            WorkerResult(success=False, message="Connection refused"),  # nc 失败
-        ]
+        mock_shell.execute.side_effect = _results(
+            (True, "000"),  # curl 失败
+            (False, "Connection refused"),  # nc 失败
+        )
 
         healthy, message = await executor.check_port_health(port=9999)
 
         assert healthy is False
-        assert "无法连接" in message or "无法访问" in message
+        assert _UNREACHABLE_RE.search(message)
 
     @pytest.mark.asyncio
     async def test_port_health_check_fallback_to_nc(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试 curl 失败时回退到 nc"""
-        mock_shell.execute.side_effect = [
-            WorkerResult(success=True, message="000"),  # curl 无法连接
-            WorkerResult(success=True, message="Connection succeeded"),  # nc 成功
-        ]
+        mock_shell.execute.side_effect = _results(
+            (True, "000"),  # curl 无法连接
+            (True, "Connection succeeded"),  # nc 成功
+        )
 
         healthy, message = await executor.check_port_health(port=6379)
 
@@ -334,7 +342,7 @@ class TestVerificationTrigger:
 
     @pytest.mark.asyncio
     async def test_verification_triggers_for_docker_run(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试包含 docker run 的部署会触发验证"""
         deploy_steps = [
@@ -355,7 +363,7 @@ class TestVerificationTrigger:
 
     @pytest.mark.asyncio
     async def test_verification_triggers_for_docker_compose(
-        self, executor: DeployExecutor, mock_shell: MagicMock
+        self, executor: DeployExecutor, mock_shell: AsyncMock
     ) -> None:
         """测试包含 docker compose 的部署会触发验证"""
         deploy_steps = [{"description": "启动", "command": "docker compose up -d"}]
@@ -7,43 +7,189 @@ DeployWorker 只暴露一个 action: deploy（一键部署）。
 from __future__ import annotations
 
 import json
-from unittest.mock import AsyncMock, MagicMock, patch
+import re
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from src.types import WorkerResult
+from src.types import ArgValue, WorkerResult
 from src.workers.deploy import DeployWorker
+from src.workers.http import HttpWorker
+from tests.helpers import stub_repo_info
+
+# LLM 返回的部署计划均为字面量，在模块加载时序列化一次，测试中直接复用
+_DRY_RUN_PLAN = {
+    "thinking": ["Docker 项目"],
+    "project_type": "docker",
+    "steps": [
+        {"description": "构建镜像", "command": "docker build -t app ."},
+    ],
+    "notes": "",
+}
+_DRY_RUN_PLAN_JSON = json.dumps(_DRY_RUN_PLAN)
+
+_CWD_PLAN = {
+    "thinking": ["使用当前目录部署"],
+    "project_type": "python",
+    "steps": [
+        {"description": "安装依赖", "command": "pip install -r requirements.txt"},
+    ],
+    "notes": "",
+}
+_CWD_PLAN_JSON = json.dumps(_CWD_PLAN)
+
+_DOCKER_PLAN = {
+    "thinking": ["Docker 项目"],
+    "project_type": "docker",
+    "steps": [
+        {
+            "description": "启动服务",
+            "command": "docker compose up -d",
+            "risk_level": "safe",
+        },
+    ],
+    "notes": "",
+}
+_DOCKER_PLAN_JSON = json.dumps(_DOCKER_PLAN)
+
+_EMPTY_STEP_PLAN = {
+    "thinking": ["过滤空命令步骤"],
+    "project_type": "docker",
+    "steps": [
+        {"description": "空步骤", "command": "   "},
+        {"description": "启动服务", "command": "docker compose up -d"},
+    ],
+    "notes": "",
+}
+_EMPTY_STEP_PLAN_JSON = json.dumps(_EMPTY_STEP_PLAN)
+
+_EXISTING_PLAN = {
+    "thinking": ["已存在"],
+    "project_type": "docker",
+    "steps": [
+        {"description": "启动", "command": "docker compose up -d"},
+    ],
+    "notes": "",
+}
+_EXISTING_PLAN_JSON = json.dumps(_EXISTING_PLAN)
+
+# Shell 桩的共享结果：被测代码只读取 WorkerResult，可安全复用同一实例
+_OK_RES = WorkerResult(success=True, message="ok", data={"stdout": ""})
+_NOT_EXISTS_RES = WorkerResult(success=True, data={"stdout": "NOT_EXISTS"}, message="Checked")
+_EXISTS_RES = WorkerResult(success=True, data={"stdout": "EXISTS"}, message="ok")
+_RUNNING_RES = WorkerResult(success=True, message='{"Name":"app","State":"running"}')
+_CLONED_RES = WorkerResult(success=True, message="Cloned")
+_CLONE_FAIL_RES = WorkerResult(success=False, message="fatal: repository not found")
+_COMPOSE_FAIL_RES = WorkerResult(success=False, message="Error: unknown configuration error")
+
+# 无效仓库地址的错误提示关键字
+_INVALID_URL_RE = re.compile(r"无效|URL")
+
+# 命令子串 -> 结果的路由表，按顺序匹配，未命中时返回 _OK_RES
+_SHELL_ROUTES = (("test -d", _NOT_EXISTS_RES), ("docker compose ps", _RUNNING_RES))
+_EXISTING_SHELL_ROUTES = (("test -d", _EXISTS_RES), ("docker compose ps", _RUNNING_RES))
+
+
+def _routed_shell(
+    routes: tuple[tuple[str, WorkerResult], ...],
+) -> Callable[[str, dict[str, object]], WorkerResult]:
+    """根据命令子串路由返回结果的 shell 桩"""
+
+    def mock_shell_execute(action: str, args: dict[str, object]) -> WorkerResult:
+        cmd = args.get("command", "") or ""
+        return next((res for pattern, res in routes if pattern in cmd), _OK_RES)
+
+    return mock_shell_execute
+
+
+def _sequenced_shell(
+    *results: WorkerResult,
+) -> Callable[[str, dict[str, object]], WorkerResult]:
+    """按调用顺序返回预置结果的 shell 桩，耗尽后统一返回 _OK_RES"""
+    seq = iter(results)
+
+    def mock_shell_execute(action: str, args: dict[str, object]) -> WorkerResult:
+        return next(seq, _OK_RES)
+
+    return mock_shell_execute
+
+
+@dataclass(frozen=True)
+class _DeployCase:
+    """部署成功流程的参数化用例"""
+
+    plan: dict[str, object]
+    plan_json: str
+    routes: tuple[tuple[str, WorkerResult], ...]
+    args: dict[str, ArgValue]
+    expected_message: str
+    key_files: str = "docker-compose.yml"
+    cwd: Optional[str] = None
+    expect_simulated: bool = False
+    expect_task_completed: bool = False
+    forbidden_command: Optional[str] = None
+
+
+class _StubShellWorker:
+    """记录命令的 ShellWorker 桩，结果由 respond 决定"""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.respond: Callable[[str, dict[str, object]], WorkerResult] = _routed_shell(())
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.respond = _routed_shell(())
+
+    async def execute(self, action: str, args: dict[str, object]) -> WorkerResult:
+        self.calls.append(str(args.get("command", "")))
+        return self.respond(action, args)
+
+
+@pytest.fixture(scope="module")
+def mock_http_worker() -> AsyncMock:
+    """创建模拟的 HttpWorker（模块内共享，每个测试后重置）"""
+    return AsyncMock(spec=HttpWorker)
 
 
-@pytest.fixture
-def mock_http_worker() -> MagicMock:
-    """创建模拟的 HttpWorker"""
-    worker = MagicMock()
-    worker.execute = AsyncMock()
-    return worker
+@pytest.fixture(scope="module")
+def mock_shell_worker() -> _StubShellWorker:
+    """创建模拟的 ShellWorker（模块内共享，每个测试后重置）"""
+    return _StubShellWorker()
 
 
-@pytest.fixture
-def mock_shell_worker() -> MagicMock:
-    """创建模拟的 ShellWorker"""
-    worker = MagicMock()
-    worker.execute = AsyncMock()
-    return worker
+@pytest.fixture(autouse=True)
+def _reset_worker_mocks(
+    mock_http_worker: AsyncMock, mock_shell_worker: _StubShellWorker
+) -> Iterator[None]:
+    yield
+    mock_http_worker.execute.reset_mock(return_value=True, side_effect=True)
+    mock_shell_worker.reset()
 
 
 @pytest.fixture
 def mock_llm_client() -> MagicMock:
     """创建模拟的 LLMClient"""
     client = MagicMock()
-    client.generate = AsyncMock(return_value='{"steps": []}')
+    client._gen_response = '{"steps": []}'
+
+    # generate 只需被 await，使用普通协程函数代替 AsyncMock
+    async def _gen(*args: object, **kwargs: object) -> str:
+        return str(client._gen_response)
+
+    client.generate = _gen
     client.parse_json_response = MagicMock(return_value={"steps": []})
     return client
 
 
 @pytest.fixture
 def deploy_worker(
-    mock_http_worker: MagicMock,
-    mock_shell_worker: MagicMock,
+    mock_http_worker: AsyncMock,
+    mock_shell_worker: _StubShellWorker,
     mock_llm_client: MagicMock,
 ) -> DeployWorker:
     """创建 DeployWorker 实例"""
@@ -62,7 +208,6 @@ class TestDeployWorkerBasic:
         caps = deploy_worker.get_capabilities()
         assert caps == ["deploy"]
 
-    @pytest.mark.asyncio
     async def test_unknown_action(self, deploy_worker: DeployWorker) -> None:
         """测试未知动作"""
         result = await deploy_worker.execute("unknown_action", {})
@@ -73,295 +218,155 @@ class TestDeployWorkerBasic:
 class TestGitHubUrlParsing:
     """GitHub URL 解析测试"""
 
-    def test_valid_url(self, deploy_worker: DeployWorker) -> None:
-        parsed = deploy_worker._parse_github_url("https://github.com/owner/repo")
-        assert parsed == ("owner", "repo")
-
-    def test_valid_url_with_git_suffix(self, deploy_worker: DeployWorker) -> None:
-        parsed = deploy_worker._parse_github_url("https://github.com/owner/repo.git")
-        assert parsed == ("owner", "repo")
-
-    def test_valid_url_with_trailing_slash(self, deploy_worker: DeployWorker) -> None:
-        parsed = deploy_worker._parse_github_url("https://github.com/owner/repo/")
-        assert parsed == ("owner", "repo")
-
-    def test_invalid_url(self, deploy_worker: DeployWorker) -> None:
-        parsed = deploy_worker._parse_github_url("https://example.com/not-github")
-        assert parsed is None
-
-    def test_empty_url(self, deploy_worker: DeployWorker) -> None:
-        parsed = deploy_worker._parse_github_url("")
-        assert parsed is None
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("https://github.com/owner/repo", ("owner", "repo")),
+            ("https://github.com/owner/repo.git", ("owner", "repo")),
+            ("https://github.com/owner/repo/", ("owner", "repo")),
+            ("https://example.com/not-github", None),
+            ("", None),
+        ],
+        ids=["valid", "git_suffix", "trailing_slash", "not_github", "empty"],
+    )
+    def test_parse_github_url(
+        self,
+        deploy_worker: DeployWorker,
+        url: str,
+        expected: Optional[tuple[str, str]],
+    ) -> None:
+        assert deploy_worker._parse_github_url(url) == expected
 
 
 class TestDeployMissingParams:
     """deploy action 参数校验测试"""
 
-    @pytest.mark.asyncio
     async def test_missing_repo_url(self, deploy_worker: DeployWorker) -> None:
         """测试缺少 repo_url 参数"""
         result = await deploy_worker.execute("deploy", {})
         assert not result.success
         assert "repo_url" in result.message
 
-    @pytest.mark.asyncio
     async def test_invalid_github_url(self, deploy_worker: DeployWorker) -> None:
         """测试无效的 GitHub URL"""
         result = await deploy_worker.execute(
             "deploy", {"repo_url": "https://example.com/not-github"}
         )
         assert not result.success
-        assert "无效" in result.message or "URL" in result.message
-
-
-class TestDeployDryRun:
-    """deploy dry-run 模式测试"""
-
-    @pytest.mark.asyncio
-    async def test_dry_run_returns_simulated(
-        self,
-        mock_http_worker: MagicMock,
-        mock_shell_worker: MagicMock,
-        mock_llm_client: MagicMock,
-    ) -> None:
-        """测试 dry-run 模式返回模拟结果"""
-        deploy_worker = DeployWorker(mock_http_worker, mock_shell_worker, mock_llm_client)
-
-        # Mock HTTP: README + 文件列表
-        mock_http_worker.execute.side_effect = [
-            WorkerResult(
-                success=True,
-                data={"content": "# Test"},
-                message="README",
+        assert _INVALID_URL_RE.search(result.message)
+
+
+@pytest.mark.usefixtures("_no_local_project_files")
+class TestDeployHappyPath:
+    """deploy 成功流程测试（dry-run / 默认目录 / 正常部署 / 空步骤 / 已克隆）"""
+
+    @pytest.mark.parametrize(
+        "case",
+        [
+            _DeployCase(
+                plan=_DRY_RUN_PLAN,
+                plan_json=_DRY_RUN_PLAN_JSON,
+                routes=(),
+                args={"repo_url": "https://github.com/test/repo", "dry_run": True},
+                expected_message="[DRY-RUN",
+                expect_simulated=True,
+                expect_task_completed=True,
             ),
-            WorkerResult(
-                success=True,
-                data={"key_files": "docker-compose.yml"},
-                message="Files",
+            _DeployCase(
+                plan=_CWD_PLAN,
+                plan_json=_CWD_PLAN_JSON,
+                routes=(),
+                args={"repo_url": "https://github.com/test/repo", "dry_run": True},
+                expected_message="/tmp/current-workdir/repo",
+                key_files="README.md",
+                cwd="/tmp/current-workdir",
+                expect_simulated=True,
+                expect_task_completed=True,
             ),
-        ]
-
-        # LLM 返回部署计划
-        plan_response = {
-            "thinking": ["Docker 项目"],
-            "project_type": "docker",
-            "steps": [
-                {"description": "构建镜像", "command": "docker build -t app ."},
-            ],
-            "notes": "",
-        }
-        mock_llm_client.generate.return_value = json.dumps(plan_response)
-        mock_llm_client.parse_json_response.return_value = plan_response
-
-        # Shell: dry-run 不需要真正执行，但 planner.collect_env_info 会调用
-        mock_shell_worker.execute.return_value = WorkerResult(
-            success=True,
-            message="ok",
-            data={"stdout": ""},
-        )
-
-        result = await deploy_worker.execute(
-            "deploy",
-            {"repo_url": "https://github.com/test/repo", "dry_run": True},
-        )
-
-        assert result.success is True
-        assert result.simulated is True
-        assert "[DRY-RUN" in result.message
-
-    @pytest.mark.asyncio
-    async def test_default_target_dir_uses_current_working_directory(
-        self,
-        mock_http_worker: MagicMock,
-        mock_shell_worker: MagicMock,
-        mock_llm_client: MagicMock,
-    ) -> None:
-        """测试未指定 target_dir 时默认使用当前工作目录"""
-        deploy_worker = DeployWorker(mock_http_worker, mock_shell_worker, mock_llm_client)
-
-        mock_http_worker.execute.side_effect = [
-            WorkerResult(success=True, data={"content": "# Test"}, message="README"),
-            WorkerResult(success=True, data={"key_files": "README.md"}, message="Files"),
-        ]
-
-        plan_response = {
-            "thinking": ["使用当前目录部署"],
-            "project_type": "python",
-            "steps": [
-                {"description": "安装依赖", "command": "pip install -r requirements.txt"},
-            ],
-            "notes": "",
-        }
-        mock_llm_client.generate.return_value = json.dumps(plan_response)
-        mock_llm_client.parse_json_response.return_value = plan_response
-
-        mock_shell_worker.execute.return_value = WorkerResult(
-            success=True,
-            message="ok",
-            data={"stdout": ""},
-        )
-
-        with patch("os.getcwd", return_value="/tmp/current-workdir"):
-            result = await deploy_worker.execute(
-                "deploy",
-                {"repo_url": "https://github.com/test/repo", "dry_run": True},
-            )
-
-        assert result.success is True
-        assert "/tmp/current-workdir/repo" in result.message
-
-
-class TestDeploySuccess:
-    """deploy 成功流程测试"""
-
-    @pytest.mark.asyncio
-    async def test_deploy_success_with_llm_plan(
-        self,
-        mock_http_worker: MagicMock,
-        mock_shell_worker: MagicMock,
-        mock_llm_client: MagicMock,
-    ) -> None:
-        """测试一键部署成功流程（LLM 生成计划）"""
-        deploy_worker = DeployWorker(mock_http_worker, mock_shell_worker, mock_llm_client)
-
-        # Mock HTTP: README + 文件列表
-        mock_http_worker.execute.side_effect = [
-            WorkerResult(
-                success=True,
-                data={"content": "# Test Project"},
-                message="README fetched",
+            _DeployCase(
+                plan=_DOCKER_PLAN,
+                plan_json=_DOCKER_PLAN_JSON,
+                routes=_SHELL_ROUTES,
+                args={"repo_url": "https://github.com/test/repo"},
+                expected_message="部署完成",
+                expect_task_completed=True,
             ),
-            WorkerResult(
-                success=True,
-                data={"key_files": "docker-compose.yml, README.md"},
-                message="Files listed",
+            _DeployCase(
+                plan=_EMPTY_STEP_PLAN,
+                plan_json=_EMPTY_STEP_PLAN_JSON,
+                routes=_SHELL_ROUTES,
+                args={"repo_url": "https://github.com/test/repo"},
+                expected_message="已跳过 1 个空命令步骤",
+                expect_task_completed=True,
             ),
-        ]
-
-        # LLM 返回部署计划
-        plan_response = {
-            "thinking": ["这是一个 Docker 项目"],
-            "project_type": "docker",
-            "steps": [
-                {
-                    "description": "启动服务",
-                    "command": "docker compose up -d",
-                    "risk_level": "safe",
-                },
-            ],
-            "notes": "",
-        }
-        mock_llm_client.generate.return_value = json.dumps(plan_response)
-        mock_llm_client.parse_json_response.return_value = plan_response
-
-        # Shell 调用：使用 return_value 默认成功，特殊情况单独处理
-        def mock_shell_execute(action: str, args: dict[str, object]) -> WorkerResult:
-            cmd = args.get("command", "")
-            if isinstance(cmd, str):
-                if "test -d" in cmd:
-                    # check exists: 项目不存在
-                    return WorkerResult(
-                        success=True, data={"stdout": "NOT_EXISTS"}, message="Checked"
-                    )
-                elif "docker compose ps" in cmd:
-                    # 验证：服务运行中
-                    return WorkerResult(success=True, message='{"Name":"app","State":"running"}')
-            # 默认：所有其他命令成功
-            return WorkerResult(success=True, message="ok", data={"stdout": ""})
-
-        mock_shell_worker.execute.return_value = WorkerResult(
-            success=True, message="ok", data={"stdout": ""}
-        )
-        mock_shell_worker.execute.side_effect = mock_shell_execute
-
-        with patch("os.path.exists", return_value=False):
-            result = await deploy_worker.execute(
-                "deploy",
-                {"repo_url": "https://github.com/test/repo"},
-            )
-
-        assert result.success is True
-        assert "部署完成" in result.message
-        assert result.task_completed is True
-
-    @pytest.mark.asyncio
-    async def test_empty_command_steps_are_skipped(
+            _DeployCase(
+                plan=_EXISTING_PLAN,
+                plan_json=_EXISTING_PLAN_JSON,
+                routes=_EXISTING_SHELL_ROUTES,
+                args={"repo_url": "https://github.com/test/repo"},
+                expected_message="已存在",
+                expect_task_completed=True,
+                # 项目已存在时 check exists 后直接到 env_info，不应克隆
+                forbidden_command="git clone",
+            ),
+        ],
+        ids=[
+            "dry_run",
+            "default_target_dir",
+            "llm_plan_success",
+            "empty_steps_skipped",
+            "already_cloned",
+        ],
+    )
+    async def test_deploy_succeeds(
         self,
-        mock_http_worker: MagicMock,
-        mock_shell_worker: MagicMock,
+        case: _DeployCase,
+        deploy_worker: DeployWorker,
+        mock_http_worker: AsyncMock,
+        mock_shell_worker: _StubShellWorker,
         mock_llm_client: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        """测试部署计划中的空命令步骤会被跳过"""
-        deploy_worker = DeployWorker(mock_http_worker, mock_shell_worker, mock_llm_client)
+        """测试一键部署成功流程（LLM 生成计划）"""
+        if case.cwd is not None:
+            cwd = case.cwd
+            monkeypatch.setattr("src.workers.deploy.worker.os.getcwd", lambda: cwd)
 
-        mock_http_worker.execute.side_effect = [
-            WorkerResult(success=True, data={"content": "# Test Project"}, message="README"),
-            WorkerResult(
-                success=True,
-                data={"key_files": "docker-compose.yml, README.md"},
-                message="Files",
-            ),
-        ]
-
-        plan_response = {
-            "thinking": ["过滤空命令步骤"],
-            "project_type": "docker",
-            "steps": [
-                {"description": "空步骤", "command": "   "},
-                {"description": "启动服务", "command": "docker compose up -d"},
-            ],
-            "notes": "",
-        }
-        mock_llm_client.generate.return_value = json.dumps(plan_response)
-        mock_llm_client.parse_json_response.return_value = plan_response
+        stub_repo_info(mock_http_worker, case.key_files)
+        mock_llm_client._gen_response = case.plan_json
+        mock_llm_client.parse_json_response.return_value = case.plan
+        mock_shell_worker.respond = _routed_shell(case.routes)
 
-        def mock_shell_execute(action: str, args: dict[str, object]) -> WorkerResult:
-            cmd = args.get("command", "")
-            if isinstance(cmd, str):
-                if "test -d" in cmd:
-                    return WorkerResult(success=True, data={"stdout": "NOT_EXISTS"}, message="ok")
-                elif "docker compose ps" in cmd:
-                    return WorkerResult(success=True, message='{"State":"running"}')
-            return WorkerResult(success=True, message="ok", data={"stdout": ""})
-
-        mock_shell_worker.execute.side_effect = mock_shell_execute
-
-        with patch("os.path.exists", return_value=False):
-            result = await deploy_worker.execute(
-                "deploy",
-                {"repo_url": "https://github.com/test/repo"},
-            )
+        result = await deploy_worker.execute("deploy", case.args)
 
         assert result.success is True
-        assert "已跳过 1 个空命令步骤" in result.message
+        assert case.expected_message in result.message
+        assert result.simulated is case.expect_simulated
+        assert result.task_completed is case.expect_task_completed
+        if case.forbidden_command:
+            assert not any(case.forbidden_command in cmd for cmd in mock_shell_worker.calls)
 
 
+@pytest.mark.usefixtures("_no_local_project_files")
 class TestDeployFailure:
     """deploy 失败场景测试"""
 
-    @pytest.mark.asyncio
     async def test_clone_failure(
         self,
-        mock_http_worker: MagicMock,
-        mock_shell_worker: MagicMock,
+        mock_http_worker: AsyncMock,
+        mock_shell_worker: _StubShellWorker,
         mock_llm_client: MagicMock,
     ) -> None:
         """测试克隆失败"""
         deploy_worker = DeployWorker(mock_http_worker, mock_shell_worker, mock_llm_client)
 
-        mock_http_worker.execute.side_effect = [
-            WorkerResult(success=True, data={"content": "# Test"}, message="README"),
-            WorkerResult(success=True, data={"key_files": "Dockerfile"}, message="Files"),
-        ]
+        stub_repo_info(mock_http_worker, "Dockerfile")
 
-        mock_shell_worker.execute.side_effect = [
-            # mkdir
-            WorkerResult(success=True, message="ok"),
-            # check exists
-            WorkerResult(success=True, data={"stdout": "NOT_EXISTS"}, message="Checked"),
-            # git clone fails
-            WorkerResult(success=False, message="fatal: repository not found"),
-        ]
+        mock_shell_worker.respond = _sequenced_shell(
+            _OK_RES,  # mkdir
+            _NOT_EXISTS_RES,  # check exists
+            _CLONE_FAIL_RES,  # git clone fails
+        )
 
         result = await deploy_worker.execute(
             "deploy",
@@ -371,20 +376,16 @@ class TestDeployFailure:
         assert result.success is False
         assert "克隆失败" in result.message
 
-    @pytest.mark.asyncio
     async def test_empty_plan_from_llm(
         self,
-        mock_http_worker: MagicMock,
-        mock_shell_worker: MagicMock,
+        mock_http_worker: AsyncMock,
+        mock_shell_worker: _StubShellWorker,
         mock_llm_client: MagicMock,
     ) -> None:
         """测试 LLM 返回空部署计划"""
         deploy_worker = DeployWorker(mock_http_worker, mock_shell_worker, mock_llm_client)
 
-        mock_http_worker.execute.side_effect = [
-            WorkerResult(success=True, data={"content": "# Test"}, message="README"),
-            WorkerResult(success=True, data={"key_files": "README.md"}, message="Files"),
-        ]
+        stub_repo_info(mock_http_worker, "README.md")
 
         # LLM 返回空计划
         mock_llm_client.parse_json_response.return_value = {
@@ -393,129 +394,84 @@ class TestDeployFailure:
             "notes": "",
         }
 
-        env_result = WorkerResult(success=True, message="ok", data={"stdout": ""})
-        mock_shell_worker.execute.side_effect = [
-            # mkdir
-            WorkerResult(success=True, message="ok"),
-            # check exists
-            WorkerResult(success=True, data={"stdout": "NOT_EXISTS"}, message="Checked"),
-            # git clone
-            WorkerResult(success=True, message="Cloned"),
-            # collect_env_info: 5 calls
-            env_result,
-            env_result,
-            env_result,
-            env_result,
-            env_result,
-        ]
-
-        with patch("os.path.exists", return_value=False):
-            result = await deploy_worker.execute(
-                "deploy",
-                {"repo_url": "https://github.com/test/repo"},
-            )
+        # 之后 collect_env_info 的调用均返回 _OK_RES，不依赖其调用次数
+        mock_shell_worker.respond = _sequenced_shell(
+            _OK_RES,  # mkdir
+            _NOT_EXISTS_RES,  # check exists
+            _CLONED_RES,  # git clone
+        )
+
+        result = await deploy_worker.execute(
+            "deploy",
+            {"repo_url": "https://github.com/test/repo"},
+        )
 
         assert result.success is False
         assert "无法生成部署计划" in result.message
 
 
+@pytest.mark.usefixtures("_no_local_project_files")
 class TestDeployStepFailure:
     """deploy 步骤执行失败测试"""
 
-    @pytest.mark.asyncio
+    # 计划与诊断载荷按类缓存，闭包内只做迭代取值
+    _PLAN = _DOCKER_PLAN
+    _PLAN_JSON = _DOCKER_PLAN_JSON
+    _DIAG = {
+        "thinking": ["无法修复"],
+        "action": "give_up",
+        "cause": "未知配置错误",
+        "suggestion": "手动检查项目",
+    }
+    _DIAG_JSON = json.dumps(_DIAG)
+
     async def test_step_execution_failure(
         self,
-        mock_http_worker: MagicMock,
-        mock_shell_worker: MagicMock,
+        mock_http_worker: AsyncMock,
+        mock_shell_worker: _StubShellWorker,
         mock_llm_client: MagicMock,
     ) -> None:
         """测试部署步骤执行失败时的错误信息"""
         deploy_worker = DeployWorker(mock_http_worker, mock_shell_worker, mock_llm_client)
 
-        mock_http_worker.execute.side_effect = [
-            WorkerResult(success=True, data={"content": "# Test"}, message="README"),
-            WorkerResult(
-                success=True,
-                data={"key_files": "docker-compose.yml"},
-                message="Files",
-            ),
-        ]
-
-        plan_response = {
-            "thinking": ["Docker 项目"],
-            "project_type": "docker",
-            "steps": [
-                {
-                    "description": "启动服务",
-                    "command": "docker compose up -d",
-                    "risk_level": "safe",
-                },
-            ],
-            "notes": "",
-        }
-
-        diagnose_response = {
-            "thinking": ["无法修复"],
-            "action": "give_up",
-            "cause": "未知配置错误",
-            "suggestion": "手动检查项目",
-        }
+        stub_repo_info(mock_http_worker, "docker-compose.yml")
 
-        # 用一个函数根据调用顺序返回不同结果
-        generate_call_count = 0
+        # 第一次生成部署计划，之后均为诊断结果
+        gen_seq = iter([self._PLAN_JSON])
 
         async def mock_generate(*args: object, **kwargs: object) -> str:
-            nonlocal generate_call_count
-            generate_call_count += 1
-            if generate_call_count == 1:
-                return json.dumps(plan_response)
-            return json.dumps(diagnose_response)
+            return next(gen_seq, self._DIAG_JSON)
 
-        mock_llm_client.generate = AsyncMock(side_effect=mock_generate)
+        mock_llm_client.generate = mock_generate
 
-        parse_call_count = 0
+        parse_seq = iter([self._PLAN])
 
         def mock_parse(response: str) -> dict[str, object]:
-            nonlocal parse_call_count
-            parse_call_count += 1
-            if parse_call_count == 1:
-                return plan_response
-            return diagnose_response
-
-        mock_llm_client.parse_json_response = MagicMock(side_effect=mock_parse)
-
-        # 用一个函数根据调用顺序返回不同 shell 结果
-        shell_call_count = 0
-
-        async def mock_shell_execute(action: str, args: dict[str, object]) -> WorkerResult:
-            nonlocal shell_call_count
-            shell_call_count += 1
-            cmd = args.get("command", "")
-            # 前 3 次：mkdir, check exists, git clone
-            if shell_call_count <= 3:
-                if shell_call_count == 2:
-                    return WorkerResult(
-                        success=True, data={"stdout": "NOT_EXISTS"}, message="Checked"
-                    )
-                return WorkerResult(success=True, message="ok", data={"stdout": ""})
-            # collect_env_info 阶段：返回空 stdout 的成功结果
-            if isinstance(cmd, str) and any(
-                kw in cmd for kw in ["version", "docker info", "--version"]
-            ):
-                return WorkerResult(success=True, message="ok", data={"stdout": ""})
-            # execute_with_retry 阶段的命令：失败
-            if isinstance(cmd, str) and "docker compose" in cmd:
-                return WorkerResult(success=False, message="Error: unknown configuration error")
-            # 其他命令默认成功
-            return WorkerResult(success=True, message="ok", data={"stdout": ""})
-
-        mock_shell_worker.execute = AsyncMock(side_effect=mock_shell_execute)
-
-        with patch("os.path.exists", return_value=False):
-            result = await deploy_worker.execute(
-                "deploy",
-                {"repo_url": "https://github.com/test/repo"},
-            )
+            return next(parse_seq, self._DIAG)
+
+        mock_llm_client.parse_json_response = mock_parse
+
+        # 两阶段状态机：先消费 mkdir / check exists / git clone 的预置结果，
+        # 之后按命令子串路由：环境探测成功，docker compose 失败
+        bootstrap = deque([_OK_RES, _NOT_EXISTS_RES, _OK_RES])
+        env_patterns = ("version", "docker info", "--version")
+
+        def mock_shell_execute(action: str, args: dict[str, object]) -> WorkerResult:
+            if bootstrap:
+                return bootstrap.popleft()
+            cmd = args.get("command", "") or ""
+            if any(kw in cmd for kw in env_patterns):
+                return _OK_RES
+            if "docker compose" in cmd:
+                return _COMPOSE_FAIL_RES
+            return _OK_RES
+
+        mock_shell_worker.respond = mock_shell_execute
+
+        result = await deploy_worker.execute(
+            "deploy",
+            {"repo_url": "https://github.com/test/repo"},
+        )
 
         assert result.success is False
         assert "可能的解决方法" in result.message
@@ -541,65 +497,3 @@ class TestDeployCallbacks:
         callback = AsyncMock()
         deploy_worker.set_ask_user_callback(callback)
         assert deploy_worker._ask_user_callback is callback
-
-
-class TestDeployAlreadyCloned:
-    """项目已存在场景测试"""
-
-    @pytest.mark.asyncio
-    async def test_repo_already_exists_skips_clone(
-        self,
-        mock_http_worker: MagicMock,
-        mock_shell_worker: MagicMock,
-        mock_llm_client: MagicMock,
-    ) -> None:
-        """测试项目已存在时跳过克隆"""
-        deploy_worker = DeployWorker(mock_http_worker, mock_shell_worker, mock_llm_client)
-
-        mock_http_worker.execute.side_effect = [
-            WorkerResult(success=True, data={"content": "# Test"}, message="README"),
-            WorkerResult(
-                success=True,
-                data={"key_files": "docker-compose.yml"},
-                message="Files",
-            ),
-        ]
-
-        plan_response = {
-            "thinking": ["已存在"],
-            "project_type": "docker",
-            "steps": [
-                {"description": "启动", "command": "docker compose up -d"},
-            ],
-            "notes": "",
-        }
-        mock_llm_client.generate.return_value = json.dumps(plan_response)
-        mock_llm_client.parse_json_response.return_value = plan_response
-
-        def mock_shell_execute(action: str, args: dict[str, object]) -> WorkerResult:
-            cmd = args.get("command", "")
-            if isinstance(cmd, str):
-                if "test -d" in cmd:
-                    # 项目已存在
-                    return WorkerResult(success=True, data={"stdout": "EXISTS"}, message="ok")
-                elif "docker compose ps" in cmd:
-                    return WorkerResult(success=True, message='{"State":"running"}')
-            return WorkerResult(success=True, message="ok", data={"stdout": ""})
-
-        mock_shell_worker.execute.side_effect = mock_shell_execute
-
-        with patch("os.path.exists", return_value=False):
-            result = await deploy_worker.execute(
-                "deploy",
-                {"repo_url": "https://github.com/test/repo"},
-            )
-
-        assert result.success is True
-        assert "已存在" in result.message
-        # 验证没有调用 git clone（check exists 后直接到 env_info）
-        calls = mock_shell_worker.execute.call_args_list
-        commands = [
-            str(c.args[1].get("command", "") if len(c.args) > 1 else c.kwargs.get("command", ""))
-            for c in calls
-        ]
-        assert not any("git clone" in cmd for cmd in commands)
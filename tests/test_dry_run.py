@@ -1,5 +1,7 @@
 """Dry-run 模式测试"""
 
+from pathlib import Path
+
 import pytest
 
 from src.workers.system import SystemWorker
@@ -14,11 +16,11 @@ class TestDryRun:
         return SystemWorker()
 
     @pytest.mark.asyncio
-    async def test_find_large_files_dry_run(self, worker: SystemWorker) -> None:
+    async def test_find_large_files_dry_run(self, worker: SystemWorker, tmp_path: Path) -> None:
         """测试 dry-run 模式查找大文件"""
         result = await worker.execute(
             "find_large_files",
-            {"path": "/tmp", "min_size_mb": 100, "dry_run": True},
+            {"path": str(tmp_path), "min_size_mb": 100, "dry_run": True},
         )
         assert result.success is True
         assert result.simulated is True
@@ -36,11 +38,12 @@ class TestDryRun:
         assert "[DRY-RUN]" in result.message
 
     @pytest.mark.asyncio
-    async def test_delete_files_dry_run(self, worker: SystemWorker) -> None:
+    async def test_delete_files_dry_run(self, worker: SystemWorker, tmp_path: Path) -> None:
         """测试 dry-run 模式删除文件"""
+        files = [str(tmp_path / "test1.txt"), str(tmp_path / "test2.txt")]
         result = await worker.execute(
             "delete_files",
-            {"files": ["/tmp/test1.txt", "/tmp/test2.txt"], "dry_run": True},
+            {"files": files, "dry_run": True},
         )
         assert result.success is True
         assert result.simulated is True
@@ -48,6 +51,7 @@ class TestDryRun:
         assert "Would delete 2 files" in result.message
 
     @pytest.mark.asyncio
+    @pytest.mark.usefixtures("fake_disk_usage")
     async def test_normal_execution_not_simulated(self, worker: SystemWorker) -> None:
         """测试正常执行不标记为模拟"""
         result = await worker.execute(
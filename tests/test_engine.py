@@ -1,22 +1,32 @@
 """ReAct 引擎测试"""
 
-from unittest.mock import AsyncMock, patch
-
 import pytest
 
 from src.config.manager import OpsAIConfig
 from src.orchestrator.engine import OrchestratorEngine
 from src.types import Instruction, WorkerResult
+from tests.helpers import AsyncStub
 
 
-class TestOrchestratorEngine:
-    """测试 Orchestrator 引擎"""
+def _final_state(message: str, task_completed: bool = True) -> dict[str, object]:
+    """构造 ReactGraph 正常结束时的最终状态"""
+    return {
+        "final_message": message,
+        "task_completed": task_completed,
+        "needs_approval": False,
+        "messages": [],
+    }
+
+
+@pytest.fixture(scope="module")
+def engine() -> OrchestratorEngine:
+    """创建测试引擎（模块内共享，测试只读取或临时 patch 其属性）"""
+    config = OpsAIConfig()
+    return OrchestratorEngine(config)
 
-    @pytest.fixture
-    def engine(self) -> OrchestratorEngine:
-        """创建测试引擎"""
-        config = OpsAIConfig()
-        return OrchestratorEngine(config)
+
+class TestOrchestratorEngine:
+    """测试 Orchestrator 引擎：Worker 查找与指令执行"""
 
     def test_get_worker(self, engine: OrchestratorEngine) -> None:
         """测试获取 Worker"""
@@ -30,6 +40,7 @@ class TestOrchestratorEngine:
         assert worker is None
 
     @pytest.mark.asyncio
+    @pytest.mark.usefixtures("fake_disk_usage")
     async def test_execute_instruction_safe(self, engine: OrchestratorEngine) -> None:
         """测试执行安全指令"""
         instruction = Instruction(
@@ -42,6 +53,7 @@ class TestOrchestratorEngine:
 
         assert result.success is True
         assert result.data is not None
+        assert result.data["percent_used"] == 42
 
     @pytest.mark.asyncio
     async def test_execute_instruction_unknown_worker(self, engine: OrchestratorEngine) -> None:
@@ -57,46 +69,55 @@ class TestOrchestratorEngine:
         assert result.success is False
         assert "Unknown worker" in result.message
 
+
+class TestReactLoopGraph:
+    """测试基于 LangGraph 的 ReAct 循环入口"""
+
+    @pytest.fixture(autouse=True)
+    def mock_run(self, engine: OrchestratorEngine, monkeypatch: pytest.MonkeyPatch) -> AsyncStub:
+        """以 AsyncStub 替换 ReactGraph.run，测试结束后自动还原"""
+        mock = AsyncStub()
+        monkeypatch.setattr(engine._react_graph, "run", mock)
+        return mock
+
+    @pytest.fixture
+    def mock_resume(self, engine: OrchestratorEngine, monkeypatch: pytest.MonkeyPatch) -> AsyncStub:
+        """以 AsyncStub 替换 ReactGraph.resume"""
+        mock = AsyncStub()
+        monkeypatch.setattr(engine._react_graph, "resume", mock)
+        return mock
+
     @pytest.mark.asyncio
-    async def test_react_loop_graph_single_step(self, engine: OrchestratorEngine) -> None:
+    async def test_react_loop_graph_single_step(
+        self, engine: OrchestratorEngine, mock_run: AsyncStub
+    ) -> None:
         """测试单步 ReAct 循环（LangGraph）"""
-        mock_state = {
-            "final_message": "Disk 50% used",
-            "task_completed": True,
-            "needs_approval": False,
-            "messages": [],
-        }
+        mock_run.return_value = _final_state("Disk 50% used")
 
-        with patch.object(engine._react_graph, "run", new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = mock_state
+        result = await engine.react_loop_graph("检查磁盘")
 
-            result = await engine.react_loop_graph("检查磁盘")
-
-            assert result == "Disk 50% used"
-            mock_run.assert_called_once()
+        assert result == "Disk 50% used"
+        assert mock_run.call_count == 1
 
     @pytest.mark.asyncio
-    async def test_react_loop_graph_max_iterations(self, engine: OrchestratorEngine) -> None:
+    async def test_react_loop_graph_max_iterations(
+        self, engine: OrchestratorEngine, mock_run: AsyncStub
+    ) -> None:
         """测试 ReAct 循环最大迭代（LangGraph）"""
-        mock_state = {
-            "final_message": "Task incomplete: reached maximum iterations",
-            "task_completed": False,
-            "needs_approval": False,
-            "messages": [],
-        }
-
-        with patch.object(engine._react_graph, "run", new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = mock_state
+        mock_run.return_value = _final_state(
+            "Task incomplete: reached maximum iterations", task_completed=False
+        )
 
-            await engine.react_loop_graph("无限任务", max_iterations=5)
+        await engine.react_loop_graph("无限任务", max_iterations=5)
 
-            mock_run.assert_called_once()
-            # max_iterations 被传递到 ReactGraph.run
-            call_kwargs = mock_run.call_args.kwargs
-            assert call_kwargs["max_iterations"] == 5
+        assert mock_run.call_count == 1
+        # max_iterations 被传递到 ReactGraph.run
+        assert mock_run.call_kwargs["max_iterations"] == 5
 
     @pytest.mark.asyncio
-    async def test_react_loop_graph_approval_required(self, engine: OrchestratorEngine) -> None:
+    async def test_react_loop_graph_approval_required(
+        self, engine: OrchestratorEngine, mock_run: AsyncStub
+    ) -> None:
         """测试 LangGraph 返回审批中断"""
         mock_state = {
             "needs_approval": True,
@@ -104,60 +125,47 @@ class TestOrchestratorEngine:
             "messages": [],
         }
 
-        with patch.object(engine._react_graph, "run", new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = mock_state
+        mock_run.return_value = mock_state
 
-            result = await engine.react_loop_graph("高危操作")
+        result = await engine.react_loop_graph("高危操作")
 
-            assert result == "__APPROVAL_REQUIRED__"
+        assert result == "__APPROVAL_REQUIRED__"
 
     @pytest.mark.asyncio
-    async def test_react_loop_graph_error_handling(self, engine: OrchestratorEngine) -> None:
+    async def test_react_loop_graph_error_handling(
+        self, engine: OrchestratorEngine, mock_run: AsyncStub
+    ) -> None:
         """测试 LangGraph 错误处理"""
-        with patch.object(engine._react_graph, "run", new_callable=AsyncMock) as mock_run:
-            mock_run.side_effect = RuntimeError("graph failed")
+        mock_run.side_effect = RuntimeError("graph failed")
 
-            result = await engine.react_loop_graph("测试错误")
+        result = await engine.react_loop_graph("测试错误")
 
-            assert "Error in ReactGraph" in result
+        assert "Error in ReactGraph" in result
 
     @pytest.mark.asyncio
     async def test_react_loop_graph_updates_session_history(
-        self, engine: OrchestratorEngine
+        self, engine: OrchestratorEngine, mock_run: AsyncStub
     ) -> None:
         """测试 react_loop_graph 更新会话历史"""
-        mock_state = {
-            "final_message": "ok",
-            "task_completed": True,
-            "needs_approval": False,
-            "messages": [],
-        }
-
-        with patch.object(engine._react_graph, "run", new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = mock_state
+        mock_run.return_value = _final_state("ok")
 
-            history = []
-            result = await engine.react_loop_graph("测试", session_history=history)
+        history = []
+        result = await engine.react_loop_graph("测试", session_history=history)
 
-            assert result == "ok"
+        assert result == "ok"
 
     @pytest.mark.asyncio
-    async def test_resume_react_loop(self, engine: OrchestratorEngine) -> None:
+    async def test_resume_react_loop(
+        self, engine: OrchestratorEngine, mock_resume: AsyncStub
+    ) -> None:
         """测试恢复被中断的 ReAct 循环"""
-        mock_state = {
-            "final_message": "Resumed ok",
-            "task_completed": True,
-            "needs_approval": False,
-            "messages": [],
-        }
+        mock_resume.return_value = _final_state("Resumed ok")
 
-        with patch.object(engine._react_graph, "resume", new_callable=AsyncMock) as mock_resume:
-            mock_resume.return_value = mock_state
+        result = await engine.resume_react_loop("session-1", approval_granted=True)
 
-            result = await engine.resume_react_loop("session-1", approval_granted=True)
-
-            assert result == "Resumed ok"
-            mock_resume.assert_called_once_with(
-                session_id="session-1",
-                approval_granted=True,
-            )
+        assert result == "Resumed ok"
+        assert mock_resume.call_count == 1
+        assert mock_resume.call_kwargs == {
+            "session_id": "session-1",
+            "approval_granted": True,
+        }
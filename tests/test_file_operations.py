@@ -5,24 +5,51 @@
 
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
 
 import pytest
 
 from src.workers.system import SystemWorker
 
+# 预置 .env 模板：文件名 → 初始内容
+_ENV_TEMPLATES = {
+    "token.env": "TOKEN=xxxx\n",
+    "token_api_key.env": "TOKEN=xxxx\nAPI_KEY=zzzz\n",
+}
+
+
+@pytest.fixture(scope="session")
+def env_template_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """会话内只写一次的 .env 模板目录，各测试按需复制"""
+    template_dir = tmp_path_factory.mktemp("env_templates")
+    for name, content in _ENV_TEMPLATES.items():
+        (template_dir / name).write_text(content)
+    return template_dir
+
+
+@pytest.fixture(scope="module")
+def worker() -> SystemWorker:
+    """SystemWorker 不持有可变状态，模块内共享"""
+    return SystemWorker()
+
+
+def _copy_env(template_dir: Path, template: str, dest_dir: Path) -> Path:
+    """将模板复制为 dest_dir/.env"""
+    env_file = dest_dir / ".env"
+    shutil.copyfile(template_dir / template, env_file)
+    return env_file
+
 
 class TestFileOperationsWorkflow:
     """文件操作工作流集成测试"""
 
-    @pytest.mark.asyncio
-    async def test_create_env_file_workflow(self, tmp_path: Path) -> None:
+    async def test_create_env_file_workflow(self, worker: SystemWorker, tmp_path: Path) -> None:
         """场景：新建一个.env文件并写入TOKEN=xxxx
 
         模拟用户说"新建一个.env文件写入TOKEN=xxxx"
         Orchestrator 生成 write_file 指令
         """
-        worker = SystemWorker()
         env_file = tmp_path / ".env"
 
         result = await worker.execute(
@@ -34,16 +61,15 @@ class TestFileOperationsWorkflow:
         assert env_file.exists()
         assert env_file.read_text() == "TOKEN=xxxx\n"
 
-    @pytest.mark.asyncio
-    async def test_replace_env_value_workflow(self, tmp_path: Path) -> None:
+    async def test_replace_env_value_workflow(
+        self, worker: SystemWorker, tmp_path: Path, env_template_dir: Path
+    ) -> None:
         """场景：把.env的TOKEN换成yyyy
 
         模拟用户说"把.env的TOKEN换成yyyy"
         Orchestrator 生成 replace_in_file 指令
         """
-        worker = SystemWorker()
-        env_file = tmp_path / ".env"
-        env_file.write_text("TOKEN=xxxx\nAPI_KEY=zzzz\n")
+        env_file = _copy_env(env_template_dir, "token_api_key.env", tmp_path)
 
         result = await worker.execute(
             "replace_in_file",
@@ -55,16 +81,15 @@ class TestFileOperationsWorkflow:
         assert "TOKEN=yyyy" in content
         assert "API_KEY=zzzz" in content
 
-    @pytest.mark.asyncio
-    async def test_append_env_field_workflow(self, tmp_path: Path) -> None:
+    async def test_append_env_field_workflow(
+        self, worker: SystemWorker, tmp_path: Path, env_template_dir: Path
+    ) -> None:
         """场景：在.env文件增加API_KEY=zzzz
 
         模拟用户说"在.env增加API_KEY=zzzz"
         Orchestrator 生成 append_to_file 指令
         """
-        worker = SystemWorker()
-        env_file = tmp_path / ".env"
-        env_file.write_text("TOKEN=xxxx\n")
+        env_file = _copy_env(env_template_dir, "token.env", tmp_path)
 
         result = await worker.execute(
             "append_to_file",
@@ -76,8 +101,7 @@ class TestFileOperationsWorkflow:
         assert "TOKEN=xxxx\n" in content
         assert "API_KEY=zzzz\n" in content
 
-    @pytest.mark.asyncio
-    async def test_full_env_management_workflow(self, tmp_path: Path) -> None:
+    async def test_full_env_management_workflow(self, worker: SystemWorker, tmp_path: Path) -> None:
         """完整工作流：创建 → 追加 → 替换
 
         模拟完整的 .env 文件管理场景：
@@ -85,7 +109,6 @@ class TestFileOperationsWorkflow:
         2. 追加 API_KEY=zzzz
         3. 将 TOKEN 的值换成 yyyy
         """
-        worker = SystemWorker()
         env_file = tmp_path / ".env"
 
         # Step 1: 创建
@@ -2,19 +2,54 @@
 
 from __future__ import annotations
 
-from typing import Optional
-from unittest.mock import AsyncMock, Mock, patch
+from collections.abc import Iterator
+from types import SimpleNamespace
 
 import httpx
 import pytest
 
 from src.config.manager import HttpConfig
-from src.workers.http import HttpWorker
+from src.workers.http import HttpWorker, parse_github_url
+
+_CONTENTS_URL = "https://api.github.com/repos/user/repo/contents/"
+
+
+def _json_response(payload: list[dict[str, object]]) -> SimpleNamespace:
+    """构造只含 HttpWorker 实际读取属性的 JSON 响应桩"""
+    return SimpleNamespace(status_code=200, raise_for_status=lambda: None, json=lambda: payload)
+
+
+@pytest.fixture(scope="module")
+def _httpx_routes() -> Iterator[dict[str, SimpleNamespace]]:
+    """模块内只替换一次 AsyncClient.get，按 URL 从路由表取响应
+
+    未注册的 URL 按连接失败处理。作用域限定在本模块，避免补丁泄漏到同一 worker 的其他模块。
+    """
+    routes: dict[str, SimpleNamespace] = {}
+
+    async def _dispatch(client: httpx.AsyncClient, url: str, **kwargs: object) -> SimpleNamespace:
+        response = routes.get(url)
+        if response is None:
+            raise httpx.ConnectError(f"unregistered URL: {url}")
+        return response
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx.AsyncClient, "get", _dispatch)
+        yield routes
 
 
 @pytest.fixture
+def httpx_registry(
+    _httpx_routes: dict[str, SimpleNamespace],
+) -> Iterator[dict[str, SimpleNamespace]]:
+    """测试内注册 URL → 响应，测试结束后清空"""
+    yield _httpx_routes
+    _httpx_routes.clear()
+
+
+@pytest.fixture(scope="module")
 def http_worker() -> HttpWorker:
-    """创建 HttpWorker 实例"""
+    """创建 HttpWorker 实例（每次请求自建 AsyncClient，实例无连接状态，可模块内共享）"""
     config = HttpConfig(timeout=10)
     return HttpWorker(config)
 
@@ -47,25 +82,31 @@ class TestParseGithubUrl:
         result = http_worker._parse_github_url("https://gitlab.com/user/repo")
         assert result is None
 
+    def test_parse_result_is_cached(self, http_worker: HttpWorker) -> None:
+        """测试同一 URL 重复解析命中缓存"""
+        url = "https://github.com/cached-owner/cached-repo"
+        first = http_worker._parse_github_url(url)
+        hits = parse_github_url.cache_info().hits
+        assert http_worker._parse_github_url(url) is first
+        assert parse_github_url.cache_info().hits == hits + 1
+
 
 class TestFetchUrl:
     """测试 fetch_url action"""
 
-    @pytest.mark.asyncio
-    async def test_fetch_url_success(self, http_worker: HttpWorker) -> None:
+    async def test_fetch_url_success(
+        self, http_worker: HttpWorker, httpx_registry: dict[str, SimpleNamespace]
+    ) -> None:
         """测试成功获取 URL 内容"""
-        mock_response = AsyncMock()
-        mock_response.status_code = 200
-        mock_response.text = "Hello, World!"
-        mock_response.raise_for_status = Mock()
+        httpx_registry["https://example.com"] = SimpleNamespace(
+            status_code=200, text="Hello, World!", raise_for_status=lambda: None
+        )
 
-        with patch("httpx.AsyncClient.get", return_value=mock_response):
-            result = await http_worker.execute("fetch_url", {"url": "https://example.com"})
+        result = await http_worker.execute("fetch_url", {"url": "https://example.com"})
 
         assert result.success is True
         assert "Hello, World!" in result.message
 
-    @pytest.mark.asyncio
     async def test_fetch_url_invalid_url(self, http_worker: HttpWorker) -> None:
         """测试无效 URL"""
         result = await http_worker.execute("fetch_url", {"url": "not-a-valid-url"})
@@ -73,7 +114,6 @@ class TestFetchUrl:
         assert result.success is False
         assert "Invalid URL" in result.message
 
-    @pytest.mark.asyncio
     async def test_fetch_url_missing_url(self, http_worker: HttpWorker) -> None:
         """测试缺少 URL 参数"""
         result = await http_worker.execute("fetch_url", {})
@@ -85,25 +125,21 @@ class TestFetchUrl:
 class TestFetchGithubReadme:
     """测试 fetch_github_readme action"""
 
-    @pytest.mark.asyncio
-    async def test_fetch_readme_success(self, http_worker: HttpWorker) -> None:
+    async def test_fetch_readme_success(
+        self, http_worker: HttpWorker, httpx_registry: dict[str, SimpleNamespace]
+    ) -> None:
         """测试成功获取 README"""
+        httpx_registry["https://raw.githubusercontent.com/user/repo/main/README.md"] = (
+            SimpleNamespace(status_code=200, text="# Project Title\n\nThis is a README.")
+        )
 
-        async def mock_get(url: str, headers: Optional[dict[str, str]] = None) -> AsyncMock:
-            mock_response = AsyncMock()
-            mock_response.status_code = 200
-            mock_response.text = "# Project Title\n\nThis is a README."
-            return mock_response
-
-        with patch.object(httpx.AsyncClient, "get", side_effect=mock_get):
-            result = await http_worker.execute(
-                "fetch_github_readme", {"repo_url": "https://github.com/user/repo"}
-            )
+        result = await http_worker.execute(
+            "fetch_github_readme", {"repo_url": "https://github.com/user/repo"}
+        )
 
         assert result.success is True
         assert "Project Title" in result.message
 
-    @pytest.mark.asyncio
     async def test_fetch_readme_invalid_url(self, http_worker: HttpWorker) -> None:
         """测试非 GitHub URL"""
         result = await http_worker.execute(
@@ -117,38 +153,31 @@ class TestFetchGithubReadme:
 class TestListGithubFiles:
     """测试 list_github_files action"""
 
-    @pytest.mark.asyncio
-    async def test_list_files_success(self, http_worker: HttpWorker) -> None:
+    async def test_list_files_success(
+        self, http_worker: HttpWorker, httpx_registry: dict[str, SimpleNamespace]
+    ) -> None:
         """测试成功列出文件"""
-
-        async def mock_get(url: str, headers: Optional[dict[str, str]] = None) -> AsyncMock:
-            mock_response = AsyncMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = Mock()
-            mock_response.json = lambda: [
+        httpx_registry[_CONTENTS_URL] = _json_response(
+            [
                 {"name": "README.md", "type": "file", "path": "README.md", "size": 1024},
                 {"name": "Dockerfile", "type": "file", "path": "Dockerfile", "size": 512},
                 {"name": "src", "type": "dir", "path": "src", "size": 0},
             ]
-            return mock_response
+        )
 
-        with patch.object(httpx.AsyncClient, "get", side_effect=mock_get):
-            result = await http_worker.execute(
-                "list_github_files", {"repo_url": "https://github.com/user/repo"}
-            )
+        result = await http_worker.execute(
+            "list_github_files", {"repo_url": "https://github.com/user/repo"}
+        )
 
         assert result.success is True
         assert result.data is not None
 
-    @pytest.mark.asyncio
-    async def test_list_files_detects_dockerfile(self, http_worker: HttpWorker) -> None:
+    async def test_list_files_detects_dockerfile(
+        self, http_worker: HttpWorker, httpx_registry: dict[str, SimpleNamespace]
+    ) -> None:
         """测试检测 Dockerfile 存在"""
-
-        async def mock_get(url: str, headers: Optional[dict[str, str]] = None) -> AsyncMock:
-            mock_response = AsyncMock()
-            mock_response.status_code = 200
-            mock_response.raise_for_status = Mock()
-            mock_response.json = lambda: [
+        httpx_registry[_CONTENTS_URL] = _json_response(
+            [
                 {"name": "Dockerfile", "type": "file", "path": "Dockerfile", "size": 512},
                 {
                     "name": "docker-compose.yml",
@@ -157,12 +186,11 @@ class TestListGithubFiles:
                     "size": 256,
                 },
             ]
-            return mock_response
+        )
 
-        with patch.object(httpx.AsyncClient, "get", side_effect=mock_get):
-            result = await http_worker.execute(
-                "list_github_files", {"repo_url": "https://github.com/user/repo"}
-            )
+        result = await http_worker.execute(
+            "list_github_files", {"repo_url": "https://github.com/user/repo"}
+        )
 
         assert result.success is True
         assert "Dockerfile" in result.message
@@ -171,7 +199,6 @@ class TestListGithubFiles:
 class TestUnknownAction:
     """测试未知 action"""
 
-    @pytest.mark.asyncio
     async def test_unknown_action(self, http_worker: HttpWorker) -> None:
         """测试未知 action 返回错误"""
         result = await http_worker.execute("unknown_action", {})
@@ -1,50 +1,85 @@
 """集成测试"""
 
-from pathlib import Path
-from unittest.mock import AsyncMock, patch
-
 import pytest
 
 from src.config.manager import ConfigManager, OpsAIConfig
 from src.orchestrator.engine import OrchestratorEngine
 
+pytestmark = pytest.mark.integration
+
+
+class _StubGraph:
+    """只返回预设最终状态的图桩，替代真实 ReactGraph"""
+
+    def __init__(self) -> None:
+        self.final_state: dict[str, object] = {}
+
+    async def run(self, *args: object, **kwargs: object) -> dict[str, object]:
+        return self.final_state
+
+
+@pytest.fixture(scope="session")
+def base_config(tmp_path_factory: pytest.TempPathFactory) -> OpsAIConfig:
+    """从磁盘加载一次测试配置（会话内共享，只读）"""
+    config_path = tmp_path_factory.mktemp("integration") / ".opsai" / "config.json"
+    manager = ConfigManager(config_path=config_path)
+    return manager.load()
+
+
+@pytest.fixture(scope="module")
+def engine(base_config: OpsAIConfig) -> OrchestratorEngine:
+    """模块内共享的编排引擎"""
+    return OrchestratorEngine(base_config)
+
+
+@pytest.fixture(scope="module")
+def dry_engine(base_config: OpsAIConfig) -> OrchestratorEngine:
+    """模块内共享的 dry-run 编排引擎"""
+    return OrchestratorEngine(base_config, dry_run=True)
+
+
+@pytest.fixture
+def graph(engine: OrchestratorEngine, monkeypatch: pytest.MonkeyPatch) -> _StubGraph:
+    """为共享引擎装上每个测试独立的图桩，测试结束后还原原始图"""
+    stub = _StubGraph()
+    monkeypatch.setattr(engine, "_react_graph", stub)
+    return stub
+
+
+@pytest.fixture
+def dry_graph(dry_engine: OrchestratorEngine, monkeypatch: pytest.MonkeyPatch) -> _StubGraph:
+    """为 dry-run 引擎装上每个测试独立的图桩，测试结束后还原原始图"""
+    stub = _StubGraph()
+    monkeypatch.setattr(dry_engine, "_react_graph", stub)
+    return stub
+
 
 class TestIntegration:
     """集成测试"""
 
-    @pytest.fixture
-    def config(self, tmp_path: Path) -> OpsAIConfig:
-        """创建测试配置"""
-        config_path = tmp_path / ".opsai" / "config.json"
-        manager = ConfigManager(config_path=config_path)
-        return manager.load()
-
     @pytest.mark.asyncio
-    async def test_full_workflow_safe_operation(self, config: OpsAIConfig) -> None:
+    async def test_full_workflow_safe_operation(
+        self, engine: OrchestratorEngine, graph: _StubGraph
+    ) -> None:
         """测试完整工作流 - 安全操作（LangGraph）"""
-        engine = OrchestratorEngine(config)
-
-        mock_state = {
+        graph.final_state = {
             "final_message": "Disk usage: 50%",
             "task_completed": True,
             "needs_approval": False,
             "messages": [],
         }
 
-        with patch.object(engine._react_graph, "run", new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = mock_state
+        result = await engine.react_loop_graph("检查磁盘")
 
-            result = await engine.react_loop_graph("检查磁盘")
-
-            assert "Disk" in result
-            assert "Error" not in result
+        assert "Disk" in result
+        assert "Error" not in result
 
     @pytest.mark.asyncio
-    async def test_high_risk_rejected_via_graph(self, config: OpsAIConfig) -> None:
+    async def test_high_risk_rejected_via_graph(
+        self, engine: OrchestratorEngine, graph: _StubGraph
+    ) -> None:
         """测试高危操作通过 LangGraph safety 节点被拒绝"""
-        engine = OrchestratorEngine(config)
-
-        mock_state = {
+        graph.final_state = {
             "final_message": "Error: risk level high exceeds configured max risk safe",
             "task_completed": False,
             "is_error": True,
@@ -52,20 +87,15 @@ class TestIntegration:
             "messages": [],
         }
 
-        with patch.object(engine._react_graph, "run", new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = mock_state
-
-            result = await engine.react_loop_graph("删除所有文件")
+        result = await engine.react_loop_graph("删除所有文件")
 
-            assert "exceeds configured max risk" in result
+        assert "exceeds configured max risk" in result
 
     @pytest.mark.asyncio
-    async def test_execute_instruction_directly(self, config: OpsAIConfig) -> None:
+    async def test_execute_instruction_directly(self, engine: OrchestratorEngine) -> None:
         """测试直接执行指令（template run 路径）"""
         from src.types import Instruction
 
-        engine = OrchestratorEngine(config)
-
         instruction = Instruction(
             worker="system",
             action="check_disk_usage",
@@ -79,20 +109,17 @@ class TestIntegration:
         assert result.data is not None
 
     @pytest.mark.asyncio
-    async def test_dry_run_mode(self, config: OpsAIConfig) -> None:
+    async def test_dry_run_mode(
+        self, dry_engine: OrchestratorEngine, dry_graph: _StubGraph
+    ) -> None:
         """测试 dry-run 模式通过 LangGraph"""
-        engine = OrchestratorEngine(config, dry_run=True)
-
-        mock_state = {
+        dry_graph.final_state = {
             "final_message": "[DRY-RUN] Would check disk usage",
             "task_completed": True,
             "needs_approval": False,
             "messages": [],
         }
 
-        with patch.object(engine._react_graph, "run", new_callable=AsyncMock) as mock_run:
-            mock_run.return_value = mock_state
-
-            result = await engine.react_loop_graph("检查磁盘")
+        result = await dry_engine.react_loop_graph("检查磁盘")
 
-            assert "DRY-RUN" in result or "Error" not in result
+        assert "DRY-RUN" in result or "Error" not in result
@@ -2,16 +2,16 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
-
 import pytest
 
-from src.types import WorkerResult
+from src.types import ArgValue
 from src.workers.kubernetes import KubernetesWorker
+from tests.helpers import SHELL_NOT_FOUND, AsyncStub
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def worker() -> KubernetesWorker:
+    """KubernetesWorker 无状态，模块内共享同一实例"""
     return KubernetesWorker()
 
 
@@ -45,52 +45,25 @@ async def test_unknown_action(worker: KubernetesWorker) -> None:
 # ------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_get_dry_run(worker: KubernetesWorker) -> None:
-    result = await worker.execute("get", {"resource": "pods", "dry_run": True})
+@pytest.mark.parametrize(
+    ("action", "args", "expected"),
+    [
+        ("get", {"resource": "pods", "dry_run": True}, "pods"),
+        ("describe", {"resource": "pod", "name": "nginx-abc", "dry_run": True}, "nginx-abc"),
+        ("logs", {"pod": "nginx-abc", "dry_run": True}, "nginx-abc"),
+        ("top", {"resource": "pods", "dry_run": True}, "pods"),
+        ("rollout", {"subcmd": "restart", "deployment": "web", "dry_run": True}, "web"),
+        ("scale", {"deployment": "web", "replicas": 3, "dry_run": True}, "3"),
+    ],
+    ids=["get", "describe", "logs", "top", "rollout", "scale"],
+)
+async def test_dry_run(
+    worker: KubernetesWorker, action: str, args: dict[str, ArgValue], expected: str
+) -> None:
+    result = await worker.execute(action, args)
     assert result.success is True
     assert result.simulated is True
-    assert "pods" in result.message
-
-
-@pytest.mark.asyncio
-async def test_describe_dry_run(worker: KubernetesWorker) -> None:
-    result = await worker.execute("describe", {
-        "resource": "pod", "name": "nginx-abc", "dry_run": True,
-    })
-    assert result.success is True
-    assert "nginx-abc" in result.message
-
-
-@pytest.mark.asyncio
-async def test_logs_dry_run(worker: KubernetesWorker) -> None:
-    result = await worker.execute("logs", {"pod": "nginx-abc", "dry_run": True})
-    assert result.success is True
-    assert "nginx-abc" in result.message
-
-
-@pytest.mark.asyncio
-async def test_top_dry_run(worker: KubernetesWorker) -> None:
-    result = await worker.execute("top", {"resource": "pods", "dry_run": True})
-    assert result.success is True
-
-
-@pytest.mark.asyncio
-async def test_rollout_dry_run(worker: KubernetesWorker) -> None:
-    result = await worker.execute("rollout", {
-        "subcmd": "restart", "deployment": "web", "dry_run": True,
-    })
-    assert result.success is True
-    assert "web" in result.message
-
-
-@pytest.mark.asyncio
-async def test_scale_dry_run(worker: KubernetesWorker) -> None:
-    result = await worker.execute("scale", {
-        "deployment": "web", "replicas": 3, "dry_run": True,
-    })
-    assert result.success is True
-    assert "3" in result.message
+    assert expected in result.message
 
 
 # ------------------------------------------------------------------
@@ -98,47 +71,31 @@ async def test_scale_dry_run(worker: KubernetesWorker) -> None:
 # ------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_describe_missing_name(worker: KubernetesWorker) -> None:
-    result = await worker.execute("describe", {"resource": "pod", "dry_run": True})
-    assert result.success is False
-    assert "name" in result.message
-
-
-@pytest.mark.asyncio
-async def test_logs_missing_pod(worker: KubernetesWorker) -> None:
-    result = await worker.execute("logs", {"dry_run": True})
-    assert result.success is False
-    assert "pod" in result.message
-
-
-@pytest.mark.asyncio
-async def test_top_invalid_resource(worker: KubernetesWorker) -> None:
-    result = await worker.execute("top", {"resource": "deployments", "dry_run": True})
-    assert result.success is False
-    assert "pods" in result.message or "nodes" in result.message
-
-
-@pytest.mark.asyncio
-async def test_rollout_invalid_subcmd(worker: KubernetesWorker) -> None:
-    result = await worker.execute("rollout", {
-        "subcmd": "invalid", "deployment": "web", "dry_run": True,
-    })
-    assert result.success is False
-
-
-@pytest.mark.asyncio
-async def test_rollout_missing_deployment(worker: KubernetesWorker) -> None:
-    result = await worker.execute("rollout", {"subcmd": "status", "dry_run": True})
+@pytest.mark.parametrize(
+    ("action", "args", "expected"),
+    [
+        ("describe", {"resource": "pod", "dry_run": True}, "name"),
+        ("logs", {"dry_run": True}, "pod"),
+        ("top", {"resource": "deployments", "dry_run": True}, "pods"),
+        ("rollout", {"subcmd": "invalid", "deployment": "web", "dry_run": True}, "invalid"),
+        ("rollout", {"subcmd": "status", "dry_run": True}, "deployment"),
+        ("scale", {"deployment": "web", "dry_run": True}, "replicas"),
+    ],
+    ids=[
+        "describe_missing_name",
+        "logs_missing_pod",
+        "top_invalid_resource",
+        "rollout_invalid_subcmd",
+        "rollout_missing_deployment",
+        "scale_missing_replicas",
+    ],
+)
+async def test_validation_errors(
+    worker: KubernetesWorker, action: str, args: dict[str, ArgValue], expected: str
+) -> None:
+    result = await worker.execute(action, args)
     assert result.success is False
-    assert "deployment" in result.message
-
-
-@pytest.mark.asyncio
-async def test_scale_missing_replicas(worker: KubernetesWorker) -> None:
-    result = await worker.execute("scale", {"deployment": "web", "dry_run": True})
-    assert result.success is False
-    assert "replicas" in result.message
+    assert expected in result.message
 
 
 # ------------------------------------------------------------------
@@ -167,13 +124,8 @@ def test_build_cmd_with_extra(worker: KubernetesWorker) -> None:
 
 
 @pytest.mark.asyncio
-async def test_get_no_kubectl(worker: KubernetesWorker) -> None:
-    with patch.object(
-        worker._shell,
-        "execute",
-        new_callable=AsyncMock,
-        return_value=WorkerResult(success=False, message="not found"),
-    ):
-        result = await worker.execute("get", {"resource": "pods"})
-        assert result.success is False
-        assert "kubectl" in result.message
+async def test_get_no_kubectl(worker: KubernetesWorker, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(worker._shell, "execute", AsyncStub(return_value=SHELL_NOT_FOUND))
+    result = await worker.execute("get", {"resource": "pods"})
+    assert result.success is False
+    assert "kubectl" in result.message
@@ -1,29 +1,36 @@
 """LLM 客户端测试"""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
 
 import pytest
 
 from src.config.manager import LLMConfig
 from src.llm.client import LLMClient
+from tests.helpers import AsyncStub
+
+_FAKE_CONTENT = '{"worker": "system", "action": "test"}'
+# 只含 generate 实际读取的字段，且只读，可在测试间共享
+_FAKE_OPENAI_RESPONSE = SimpleNamespace(
+    choices=[SimpleNamespace(message=SimpleNamespace(content=_FAKE_CONTENT))]
+)
+
+
+@pytest.fixture(scope="module")
+def llm_client() -> LLMClient:
+    """模块内共享的客户端（SDK 客户端只初始化一次，调用均在测试内打桩）"""
+    return LLMClient(LLMConfig(model="test-model", api_key="test-key"))
 
 
 class TestLLMClient:
     """测试 LLM 客户端"""
 
-    def test_client_initialization(self) -> None:
+    def test_client_initialization(self, llm_client: LLMClient) -> None:
         """测试客户端初始化"""
-        config = LLMConfig(model="test-model", api_key="test-key")
-        client = LLMClient(config)
-
-        assert client.model == "test-model"
+        assert llm_client.model == "test-model"
 
-    def test_build_messages(self) -> None:
+    def test_build_messages(self, llm_client: LLMClient) -> None:
         """测试消息构建"""
-        config = LLMConfig()
-        client = LLMClient(config)
-
-        messages = client.build_messages(
+        messages = llm_client.build_messages(
             system_prompt="You are helpful",
             user_prompt="Hello",
         )
@@ -34,68 +41,44 @@ class TestLLMClient:
         assert messages[1]["role"] == "user"
         assert messages[1]["content"] == "Hello"
 
-    @pytest.mark.asyncio
-    async def test_generate_calls_openai(self) -> None:
+    async def test_generate_calls_openai(
+        self, llm_client: LLMClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """测试生成调用 OpenAI SDK"""
-        config = LLMConfig(model="test-model")
-        client = LLMClient(config)
-
-        mock_message = MagicMock()
-        mock_message.content = '{"worker": "system", "action": "test"}'
-
-        mock_choice = MagicMock()
-        mock_choice.message = mock_message
+        create = AsyncStub(return_value=_FAKE_OPENAI_RESPONSE)
+        monkeypatch.setattr(llm_client._client.chat.completions, "create", create)
 
-        mock_response = MagicMock()
-        mock_response.choices = [mock_choice]
-
-        with patch.object(
-            client._client.chat.completions,
-            "create",
-            new_callable=AsyncMock,
-        ) as mock_create:
-            mock_create.return_value = mock_response
-
-            result = await client.generate(
-                system_prompt="System",
-                user_prompt="User",
-            )
+        result = await llm_client.generate(
+            system_prompt="System",
+            user_prompt="User",
+        )
 
-            assert result == '{"worker": "system", "action": "test"}'
-            mock_create.assert_called_once()
+        assert result == _FAKE_CONTENT
+        assert create.call_count == 1
 
-    def test_parse_json_response_valid(self) -> None:
+    def test_parse_json_response_valid(self, llm_client: LLMClient) -> None:
         """测试解析有效 JSON"""
-        config = LLMConfig()
-        client = LLMClient(config)
-
         response = '{"worker": "system", "action": "test", "args": {}}'
-        result = client.parse_json_response(response)
+        result = llm_client.parse_json_response(response)
 
         assert result is not None
         assert result["worker"] == "system"
         assert result["action"] == "test"
 
-    def test_parse_json_response_with_markdown(self) -> None:
+    def test_parse_json_response_with_markdown(self, llm_client: LLMClient) -> None:
         """测试解析带 Markdown 的 JSON"""
-        config = LLMConfig()
-        client = LLMClient(config)
-
         response = """Here is the response:
 ```json
 {"worker": "system", "action": "test"}
 ```"""
-        result = client.parse_json_response(response)
+        result = llm_client.parse_json_response(response)
 
         assert result is not None
         assert result["worker"] == "system"
 
-    def test_parse_json_response_invalid(self) -> None:
+    def test_parse_json_response_invalid(self, llm_client: LLMClient) -> None:
         """测试解析无效 JSON"""
-        config = LLMConfig()
-        client = LLMClient(config)
-
         response = "This is not JSON"
-        result = client.parse_json_response(response)
+        result = llm_client.parse_json_response(response)
 
         assert result is None
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Optional, Union
+
 import pytest
 
+from src.types import WorkerResult
 from src.workers.log_analyzer import LogAnalyzerWorker
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def worker() -> LogAnalyzerWorker:
+    """LogAnalyzerWorker 无状态，模块内共享同一实例"""
     return LogAnalyzerWorker()
 
 
@@ -43,55 +48,45 @@ SAMPLE_LOGS = """2024-01-15T09:30:01Z INFO  Server started on port 8080
 2024-01-15T09:30:35Z INFO  Health check OK
 2024-01-15T09:31:00Z FATAL Out of memory
 """
+_SAMPLE_LOGS_BYTES = SAMPLE_LOGS.encode("utf-8")
 
 
-@pytest.mark.asyncio
-async def test_analyze_lines_basic(worker: LogAnalyzerWorker) -> None:
-    result = await worker.execute("analyze_lines", {"lines": SAMPLE_LOGS})
-    assert result.success is True
-    assert result.task_completed is True
-    assert "日志分析" in result.message
+@pytest.fixture(scope="module")
+async def sample_analysis(worker: LogAnalyzerWorker) -> WorkerResult:
+    """SAMPLE_LOGS 的分析结果只计算一次（WorkerResult 只读，可在测试间共享）"""
+    return await worker.execute("analyze_lines", {"lines": SAMPLE_LOGS})
 
 
-@pytest.mark.asyncio
-async def test_analyze_lines_level_counts(worker: LogAnalyzerWorker) -> None:
-    result = await worker.execute("analyze_lines", {"lines": SAMPLE_LOGS})
+@pytest.fixture(scope="module")
+def sample_rows(sample_analysis: WorkerResult) -> dict[str, dict[str, Union[str, int]]]:
+    """按 name 索引分析结果的数据行（name 唯一），断言直接按键取值"""
+    assert sample_analysis.success is True
+    assert isinstance(sample_analysis.data, list)
+    return {str(row["name"]): row for row in sample_analysis.data}
+
+
+def test_analyze_lines_basic(sample_analysis: WorkerResult) -> None:
+    result = sample_analysis
     assert result.success is True
-    assert isinstance(result.data, list)
+    assert result.task_completed is True
+    assert "日志分析" in result.message
 
-    # 找到级别计数
-    level_data = {
-        r["name"]: r["count"]
-        for r in result.data
-        if isinstance(r, dict) and str(r.get("name", "")).startswith("level_")
-    }
-    assert level_data.get("level_ERROR") == 4
-    assert level_data.get("level_WARN") == 2
-    assert level_data.get("level_INFO") == 4
-    assert level_data.get("level_FATAL") == 1
 
+def test_analyze_lines_level_counts(sample_rows: dict[str, dict[str, Union[str, int]]]) -> None:
+    assert sample_rows["level_ERROR"]["count"] == 4
+    assert sample_rows["level_WARN"]["count"] == 2
+    assert sample_rows["level_INFO"]["count"] == 4
+    assert sample_rows["level_FATAL"]["count"] == 1
 
-@pytest.mark.asyncio
-async def test_analyze_lines_error_patterns(worker: LogAnalyzerWorker) -> None:
-    result = await worker.execute("analyze_lines", {"lines": SAMPLE_LOGS})
-    assert result.success is True
-    assert isinstance(result.data, list)
 
-    error_data = [
-        r for r in result.data
-        if isinstance(r, dict) and str(r.get("name", "")).startswith("error_")
-    ]
-    # 至少有错误模式
-    assert len(error_data) >= 1
+def test_analyze_lines_error_patterns(sample_rows: dict[str, dict[str, Union[str, int]]]) -> None:
     # Connection timeout 出现 3 次，应该是 top 错误
-    top_error = error_data[0]
-    assert top_error["count"] == 3
+    assert sample_rows["error_0"]["count"] == 3
 
 
-@pytest.mark.asyncio
-async def test_analyze_lines_trend(worker: LogAnalyzerWorker) -> None:
+def test_analyze_lines_trend(sample_analysis: WorkerResult) -> None:
     """测试趋势计算 - 所有日志在 09:30 窗口"""
-    result = await worker.execute("analyze_lines", {"lines": SAMPLE_LOGS})
+    result = sample_analysis
     assert result.success is True
     assert "09:30" in result.message or "总行数" in result.message
 
@@ -114,61 +109,70 @@ async def test_analyze_lines_empty(worker: LogAnalyzerWorker) -> None:
 # 日志解析细节
 # ------------------------------------------------------------------
 
-def test_parse_line_iso_timestamp(worker: LogAnalyzerWorker) -> None:
-    entry = worker._parse_line("2024-01-15T09:30:45.123Z ERROR Something broke")
-    assert entry.timestamp == "2024-01-15T09:30:45.123Z"
-    assert entry.level == "ERROR"
-    assert "broke" in entry.message
-
-
-def test_parse_line_syslog_format(worker: LogAnalyzerWorker) -> None:
-    entry = worker._parse_line("Jan 15 09:30:45 myhost sshd[1234]: Connection from 10.0.0.1")
-    assert entry.timestamp == "Jan 15 09:30:45"
-    assert entry.level == "UNKNOWN"
-
-
-def test_parse_line_nginx_error(worker: LogAnalyzerWorker) -> None:
-    entry = worker._parse_line(
-        '2024/01/15 09:30:45 [error] 1234#0: *5678 upstream timed out'
-    )
-    assert entry.level == "ERROR"
-
-
-def test_parse_line_warn_level(worker: LogAnalyzerWorker) -> None:
-    entry = worker._parse_line("2024-01-15 09:30:45 WARNING Disk almost full")
-    assert entry.level == "WARN"
-
-
-def test_parse_line_no_timestamp(worker: LogAnalyzerWorker) -> None:
-    entry = worker._parse_line("ERROR: something failed")
-    assert entry.timestamp is None
-    assert entry.level == "ERROR"
+_ISO_LINE = "2024-01-15T09:30:45.123Z ERROR Something broke"
+_SYSLOG_LINE = "Jan 15 09:30:45 myhost sshd[1234]: Connection from 10.0.0.1"
+_NGINX_LINE = "2024/01/15 09:30:45 [error] 1234#0: *5678 upstream timed out"
+_WARN_LINE = "2024-01-15 09:30:45 WARNING Disk almost full"
+_NO_TS_LINE = "ERROR: something failed"
+
+
+@pytest.mark.parametrize(
+    ("line", "level"),
+    [
+        (_ISO_LINE, "ERROR"),
+        (_SYSLOG_LINE, "UNKNOWN"),
+        (_NGINX_LINE, "ERROR"),
+        (_WARN_LINE, "WARN"),
+        (_NO_TS_LINE, "ERROR"),
+    ],
+    ids=["iso", "syslog", "nginx_error", "warn", "no_timestamp"],
+)
+def test_parse_line_level(worker: LogAnalyzerWorker, line: str, level: str) -> None:
+    assert worker._parse_line(line).level == level
+
+
+@pytest.mark.parametrize(
+    ("line", "timestamp", "message"),
+    [
+        (_ISO_LINE, "2024-01-15T09:30:45.123Z", "broke"),
+        (_SYSLOG_LINE, "Jan 15 09:30:45", "Connection from"),
+        (_WARN_LINE, "2024-01-15 09:30:45", "Disk almost full"),
+        (_NO_TS_LINE, None, "something failed"),
+    ],
+    ids=["iso", "syslog", "common", "no_timestamp"],
+)
+def test_parse_line_timestamp(
+    worker: LogAnalyzerWorker, line: str, timestamp: Optional[str], message: str
+) -> None:
+    entry = worker._parse_line(line)
+    assert entry.timestamp == timestamp
+    assert message in entry.message
 
 
 # ------------------------------------------------------------------
 # 消息归一化
 # ------------------------------------------------------------------
 
-def test_normalize_ips(worker: LogAnalyzerWorker) -> None:
-    result = worker._normalize_message("Connection from 192.168.1.100 port 22")
-    assert "<IP>" in result
-    assert "192.168.1.100" not in result
-
-
-def test_normalize_numbers(worker: LogAnalyzerWorker) -> None:
-    result = worker._normalize_message("Process 12345 exited with code 1")
-    assert "<N>" in result
-    assert "12345" not in result
-
-
-def test_normalize_hex_ids(worker: LogAnalyzerWorker) -> None:
-    result = worker._normalize_message("container abc123def456 stopped")
-    assert "<HEX>" in result
-
-
-def test_normalize_uuid(worker: LogAnalyzerWorker) -> None:
-    result = worker._normalize_message("request 550e8400-e29b-41d4-a716-446655440000 failed")
-    assert "<UUID>" in result
+@pytest.mark.parametrize(
+    ("message", "placeholder", "original"),
+    [
+        ("Connection from 192.168.1.100 port 22", "<IP>", "192.168.1.100"),
+        ("Process 12345 exited with code 1", "<N>", "12345"),
+        ("container abc123def456 stopped", "<HEX>", "abc123def456"),
+        (
+            "request 550e8400-e29b-41d4-a716-446655440000 failed",
+            "<UUID>",
+            "550e8400-e29b-41d4-a716-446655440000",
+        ),
+    ],
+    ids=["ip", "number", "hex_id", "uuid"],
+)
+def test_normalize_message(
+    worker: LogAnalyzerWorker, message: str, placeholder: str, original: str
+) -> None:
+    result = worker._normalize_message(message)
+    assert placeholder in result
+    assert original not in result
 
 
 # ------------------------------------------------------------------
@@ -195,11 +199,10 @@ async def test_unknown_action(worker: LogAnalyzerWorker) -> None:
 # ------------------------------------------------------------------
 
 @pytest.mark.asyncio
-async def test_analyze_file(worker: LogAnalyzerWorker, tmp_path: object) -> None:
+async def test_analyze_file(worker: LogAnalyzerWorker, tmp_path: Path) -> None:
     """测试文件分析"""
-    from pathlib import Path
-    log_file = Path(str(tmp_path)) / "test.log"
-    log_file.write_text(SAMPLE_LOGS, encoding="utf-8")
+    log_file = tmp_path / "test.log"
+    log_file.write_bytes(_SAMPLE_LOGS_BYTES)
 
     result = await worker.execute("analyze_file", {"path": str(log_file)})
     assert result.success is True
@@ -220,10 +223,10 @@ async def test_analyze_file_not_found(worker: LogAnalyzerWorker) -> None:
 @pytest.mark.asyncio
 async def test_dedup_repeated_errors(worker: LogAnalyzerWorker) -> None:
     """100 行相同的错误应该聚合为 1 个模式"""
-    lines = "\n".join(
+    lines = "\n".join([
         f"2024-01-15T09:{i // 60:02d}:{i % 60:02d}Z ERROR Connection timeout to db:5432"
         for i in range(100)
-    )
+    ])
     result = await worker.execute("analyze_lines", {"lines": lines})
     assert result.success is True
     assert isinstance(result.data, list)
@@ -11,8 +11,11 @@ from src.context.memory import MemoryEntry, SessionMemory
 
 
 @pytest.fixture
-def memory(tmp_path: Path) -> SessionMemory:
-    return SessionMemory(memory_path=tmp_path / "memory.json")
+def memory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> SessionMemory:
+    """纯内存记忆：跳过每次写操作的 JSON 落盘，持久化由下方专门的测试覆盖"""
+    mem = SessionMemory(memory_path=tmp_path / "memory.json")
+    monkeypatch.setattr(mem, "_save", lambda: None)
+    return mem
 
 
 # ------------------------------------------------------------------
@@ -187,8 +190,8 @@ def test_enforce_limit(tmp_path: Path) -> None:
     path = tmp_path / "memory.json"
     mem = SessionMemory(memory_path=path)
 
-    # 写入超过 MAX_ENTRIES
-    for i in range(SessionMemory.MAX_ENTRIES + 50):
+    # 写入超过 MAX_ENTRIES，每次 remember 都会触发淘汰
+    for i in range(SessionMemory.MAX_ENTRIES + 5):
         mem.remember(f"key{i}", f"value{i}")
 
     assert mem.size <= SessionMemory.MAX_ENTRIES